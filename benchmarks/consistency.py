@@ -0,0 +1,106 @@
+# consistency.py
+#
+# Checks the claims the statistics, hand history and parallel simulator rely on, exit 1 if any fails:
+#     python benchmarks/consistency.py
+# - SessionStats merged from shards equals the stats of the same hands played in one run (drawdown included)
+# - a hand history written by the engine reads back record for record, and its stats match the live ones
+# - simulate_rounds gives identical results whatever the number of workers
+
+import os
+import random
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from blackjack.engine import RoundEngine
+from blackjack.history import HandHistory, HandHistoryWriter, HEADER, RECORD, OUTCOMES
+from blackjack.parallel import simulate_rounds
+from blackjack.policies import HitBelow
+from blackjack.stats import SessionStats
+
+HANDS = 5000
+SHARDS = 7
+
+def play(hands, seed, on_hand=None):
+    # Deterministic session with restarts, on_hand(index, engine) is called before each round
+    engine = RoundEngine(rng=random.Random(seed))
+    policy = HitBelow(16, bet=150)
+    for index in range(hands):
+        if on_hand is not None:
+            on_hand(index, engine)
+        if engine.player.balance < 150:
+            engine.restart()
+        engine.play_round(policy)
+    return engine
+
+def counters(stats):
+    return {name: value for name, value in stats.to_dict()['counters'].items() if name != 'start_balance'}
+
+def check_merge():
+    whole = SessionStats()
+    def attach_whole(index, engine):
+        engine.stats = whole
+    play(HANDS, 1, attach_whole)
+
+    shards = [SessionStats() for _ in range(SHARDS)]
+    def attach_shard(index, engine):
+        engine.stats = shards[index * SHARDS // HANDS]
+    play(HANDS, 1, attach_shard)
+    merged = SessionStats()
+    for shard in shards:
+        merged.merge(shard)
+    return counters(merged) == counters(whole) and whole.max_drawdown > 0
+
+def check_history():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'hands.bin')
+        live = SessionStats()
+        hands = []
+        def attach(index, engine):
+            if index:
+                return
+            engine.recorder = HandHistoryWriter(path)
+            engine.stats = live
+            finish = engine.finish_round
+            def record_hand():
+                finish()
+                hands.append((engine.player.bet, engine.player.balance, engine.outcome,
+                              bytes(engine.player.hand.codes), bytes(engine.dealer.hand.codes)))
+            engine.finish_round = record_hand
+        engine = play(HANDS, 2, attach)
+        engine.recorder.close()
+
+        layout = os.path.getsize(path) == HEADER.size + len(hands) * RECORD.size and RECORD.size == 80
+        replayed = SessionStats()
+        with HandHistory(path) as history:
+            records = list(history)
+            for record in records:
+                replayed.add_record(record)
+        same = [(r.bet, r.balance, r.outcome, r.player, r.dealer) for r in records] == hands
+        numbered = [record.hand for record in records] == list(range(len(hands)))
+        known = all(record.outcome in OUTCOMES for record in records)
+        return layout and same and numbered and known and replayed.to_dict() == live.to_dict()
+
+def check_workers():
+    results = [simulate_rounds(20_000, seed=5, workers=workers, chunk_rounds=1_500) for workers in (1, 3)]
+    return results[0].stats.to_dict() == results[1].stats.to_dict()
+
+CHECKS = {
+    'merge_equals_sequential': check_merge,
+    'history_round_trip': check_history,
+    'worker_count_invariance': check_workers,
+}
+
+def main():
+    failed = []
+    for name, check in CHECKS.items():
+        ok = check()
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failed.append(name)
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
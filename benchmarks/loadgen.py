@@ -0,0 +1,115 @@
+# loadgen.py
+#
+# Load generator for blackjack.server: opens one connection (one table) per simulated player and
+# plays hit-below-17 rounds as fast as replies come back, then reports the server's throughput:
+#     python benchmarks/loadgen.py --tables 500 --duration 10
+# Without --port it starts its own server process (dealer delay 0) so the server gets a core of its own.
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+async def wait_for_round(reader, reply):
+    # A stand with a dealer delay replies straight away, the dealer's cards arrive as pushes
+    while reply['state'] in ("DEALER_TURN", "DEALER_HITTING"):
+        reply = json.loads(await reader.readline())
+    return reply
+
+async def play(host, port, deadline, bet, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    state = json.loads(await reader.readline())  # joined
+    rounds = 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        if state['state'] == "GAME_ENDED":
+            state = await request(reader, writer, {'action': 'restart'})
+        elif state['state'] == "PLAYER_TURN":
+            action = 'hit' if state['player_total'] < 17 else 'stand'
+            state = await wait_for_round(reader, await request(reader, writer, {'action': action}))
+        else:
+            state = await request(reader, writer, {'action': 'bet', 'amount': min(bet, state['balance'])})
+            rounds += 1
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    return rounds
+
+async def run_load(host, port, tables, duration, bet):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    rounds = await asyncio.gather(*(play(host, port, deadline, bet, latencies) for _ in range(tables)))
+    elapsed = time.perf_counter() - started
+
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readline()
+    metrics = await request(reader, writer, {'action': 'metrics'})
+    writer.close()
+
+    latencies.sort()
+    return {
+        'tables': tables,
+        'seconds': elapsed,
+        'rounds': sum(rounds),
+        'rounds_per_second': sum(rounds) / elapsed,
+        'actions_per_second': len(latencies) / elapsed,
+        'client_p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else None,
+        'client_p99_ms': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else None,
+        'server_p50_ms': metrics['latency_p50_ms'],
+        'server_p99_ms': metrics['latency_p99_ms'],
+    }
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+def start_server(port, dealer_delay):
+    server = subprocess.Popen([sys.executable, '-m', 'blackjack.server', '--port', str(port),
+                               '--dealer-delay', str(dealer_delay)],
+                              env=dict(os.environ, PYTHONPATH=ROOT))
+    for _ in range(100):  # Wait for it to listen
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return server
+        except ConnectionRefusedError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("server didn't start")
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive many tables on a blackjack.server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="connect to a running server instead of starting one")
+    parser.add_argument('--tables', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--bet', type=int, default=10)
+    parser.add_argument('--dealer-delay', type=float, default=0.0, help="for the server this starts")
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        port = free_port()
+        server = start_server(port, args.dealer_delay)
+    try:
+        result = asyncio.run(run_load(args.host, port, args.tables, args.duration, args.bet))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(json.dumps(result, indent=2))
+
+if __name__ == '__main__':
+    main()
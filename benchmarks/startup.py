@@ -0,0 +1,120 @@
+# startup.py
+#
+# Cold-start benchmark, each measurement runs in a fresh interpreter:
+#     python benchmarks/startup.py
+# Build the asset pack first (python -m blackjack.asset_pack from blackjack/) to see its effect.
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = os.path.join(ROOT, 'blackjack')  # resource_path() resolves Images/ from here
+
+# Each snippet prints the elapsed seconds of the part being measured
+SNIPPETS = {
+    'import_engine': """
+import time
+start = time.perf_counter()
+import blackjack.engine
+print(time.perf_counter() - start)
+""",
+    'import_game': """
+import time
+start = time.perf_counter()
+import blackjack.game
+print(time.perf_counter() - start)
+""",
+    'first_frame': """
+import time
+start = time.perf_counter()
+import pygame
+from blackjack.game import Game
+pygame.init()
+screen = pygame.display.set_mode((1800, 990), pygame.RESIZABLE)
+Game(screen, record_history=False).draw()
+print(time.perf_counter() - start)
+""",
+    'time_to_first_frame': """
+import time
+start = time.perf_counter()
+import pygame
+from blackjack.assets import preload_images
+from blackjack.splash import show_splash
+pygame.init()
+screen = pygame.display.set_mode((1800, 990), pygame.RESIZABLE)
+show_splash(screen, preload_images())
+from blackjack.game import Game
+Game(screen, record_history=False).draw()
+print(time.perf_counter() - start)
+""",
+    'load_card_images': """
+import time
+import pygame
+from blackjack.assets import load_card_images
+pygame.init()
+start = time.perf_counter()
+load_card_images()
+print(time.perf_counter() - start)
+""",
+    'load_card_images_serial': """
+import time
+import pygame
+from blackjack.assets import load_card_images
+pygame.init()
+start = time.perf_counter()
+load_card_images(workers=1)
+print(time.perf_counter() - start)
+""",
+    'decode_all_png': """
+import time
+from blackjack.assets import IMAGE_FILES, decode_image
+start = time.perf_counter()
+for name in IMAGE_FILES:
+    decode_image(name)
+print(time.perf_counter() - start)
+""",
+    'decode_all_png_parallel': """
+import time
+from concurrent.futures import ThreadPoolExecutor
+from blackjack.assets import IMAGE_FILES, decode_image
+start = time.perf_counter()
+with ThreadPoolExecutor() as executor:
+    list(executor.map(decode_image, IMAGE_FILES))
+print(time.perf_counter() - start)
+""",
+    'load_all_packed': """
+import time, os
+from blackjack.assets import IMAGE_FILES, PACK_PATH, resource_path
+from blackjack.asset_pack import AssetPack
+if not os.path.exists(resource_path(PACK_PATH)):
+    print('null')
+else:
+    start = time.perf_counter()
+    pack = AssetPack(resource_path(PACK_PATH))
+    for name in IMAGE_FILES:
+        pack.load(name)
+    print(time.perf_counter() - start)
+""",
+}
+
+def measure(snippet, repeat=5):
+    # Best of several cold runs, in seconds (None if the snippet couldn't measure)
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy',
+               PYGAME_HIDE_SUPPORT_PROMPT='1', PYTHONPATH=ROOT)
+    results = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', snippet], cwd=ASSET_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        value = json.loads(output.strip().splitlines()[-1])
+        if value is None:
+            return None
+        results.append(value)
+    return min(results)
+
+def run(repeat=5):
+    return {name: measure(snippet, repeat) for name, snippet in SNIPPETS.items()}
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
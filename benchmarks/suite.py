@@ -0,0 +1,177 @@
+# suite.py
+#
+# Headless benchmark suite (SDL dummy video driver). Every result is seconds per operation, lower is better:
+#     python benchmarks/suite.py                          # print JSON
+#     python benchmarks/suite.py --save baseline.json     # keep a baseline
+#     python benchmarks/suite.py --compare baseline.json  # ratio against it, exit 1 on a regression
+
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIR = os.path.join(ROOT, 'blackjack')
+sys.path.insert(0, ROOT)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import startup
+
+SCREEN_SIZE = (1800, 990)
+RESIZE_SIZE = (1280, 720)
+DRAWN_STATES = ("BETTING", "PLAYER_TURN", "DEALER_HITTING", "GAME_OVER", "GAME_ENDED")
+
+def per_call(function, number, repeat=5):
+    # Best average time of one call over several timed loops
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_engine():
+    from blackjack.card import Card
+    from blackjack.deck import Deck
+    from blackjack.engine import RoundEngine
+    from blackjack.player import Player
+    from blackjack.policies import HitBelow
+
+    player = Player("Player", 1000)
+    for card in (Card('ace', 'hearts'), Card('7', 'clubs'), Card('king', 'spades')):
+        player.add_card(card)
+
+    engine = RoundEngine()
+    policy = HitBelow(17, bet=10)
+    def play_round():
+        if engine.player.balance < 10:
+            engine.restart()
+        engine.play_round(policy)
+
+    deck = Deck()
+    return {
+        'deck_construction': per_call(Deck, 2000),
+        'deck_shuffle': per_call(deck.shuffle, 2000),
+        'player_get_total': per_call(player.get_total, 200_000),
+        'round_logic': per_call(play_round, 20_000),
+    }
+
+def set_state(game, state):
+    # Put a fresh round of the game's engine in one of the drawn states
+    engine = game.engine
+    engine.restart()
+    if state == "BETTING":
+        return
+    engine.place_bet(100)
+    engine.advance()
+    while state != "PLAYER_TURN" and engine.state == "PLAYER_TURN" and engine.player.hand.total < 12:
+        engine.hit()  # Give the dealer something to draw against
+    if state in ("DEALER_HITTING", "GAME_OVER", "GAME_ENDED") and engine.state == "PLAYER_TURN":
+        engine.stand()
+        engine.step()  # Hole card revealed, dealer about to hit
+    if state in ("GAME_OVER", "GAME_ENDED"):
+        engine.advance()
+    if state == "GAME_ENDED":
+        engine.player.balance = 0
+        engine.next_round()
+
+def reshuffle_frame(game, prepared, repeat=5):
+    # Reshuffle plus the first full frame of the new shoe, with nothing loaded or scaled yet unless the
+    # shoe preparer got to run first (it does so while the previous shoe is being played)
+    from blackjack.assets import card_images
+    from blackjack.surface_cache import card_surfaces
+    best = None
+    for _ in range(repeat):
+        game.shoe_preparer.wait()
+        card_images.clear()
+        card_surfaces.clear()
+        game.deck.next_codes = None
+        if prepared:
+            game.shoe_preparer.prepare(game.deck, game.CARD_SIZE)
+            game.shoe_preparer.wait()
+        set_state(game, "PLAYER_TURN")
+        game.renderer.invalidate()
+        start = time.perf_counter()
+        game.deck.shuffle()
+        game.draw()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def bench_game():
+    import pygame
+    from blackjack.game import Game
+
+    pygame.init()
+    game = Game(pygame.display.set_mode(SCREEN_SIZE, pygame.RESIZABLE), record_history=False)
+
+    results = {}
+    for state in DRAWN_STATES:
+        set_state(game, state)
+        game.draw()
+        results[f'draw_{state.lower()}'] = per_call(game.draw, 200)  # Unchanged frame
+
+        def full_frame():
+            game.renderer.invalidate()
+            game.draw()
+        results[f'draw_{state.lower()}_full'] = per_call(full_frame, 50)
+
+    results['reshuffle_frame_cold'] = reshuffle_frame(game, prepared=False)
+    results['reshuffle_frame_prepared'] = reshuffle_frame(game, prepared=True)
+
+    sizes = [RESIZE_SIZE, SCREEN_SIZE]
+    def resize():
+        sizes.reverse()
+        game.handle_resize(sizes[0])
+        game.draw()
+    results['handle_resize'] = per_call(resize, 20)
+    pygame.quit()
+    return results
+
+def run(startup_repeat=3):
+    os.chdir(ASSET_DIR)  # resource_path() resolves Images/ and Data/ from here
+    results = {f'startup_{name}': value for name, value in startup.run(startup_repeat).items()}
+    results.update(bench_engine())
+    results.update(bench_game())
+    return results
+
+def compare(results, baseline, threshold):
+    # Ratio of each result to the baseline, names slower by more than threshold are regressions
+    report = {}
+    regressions = []
+    for name, value in results.items():
+        before = baseline.get(name)
+        if value is None or not before:
+            continue
+        ratio = value / before
+        report[name] = {'baseline': before, 'current': value, 'ratio': ratio}
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return report, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite")
+    parser.add_argument('--save', help="write the results to this baseline file")
+    parser.add_argument('--compare', help="compare against this baseline file")
+    parser.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown before failing, 0.10 = 10%%")
+    parser.add_argument('--startup-repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    results = run(args.startup_repeat)
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            report, regressions = compare(results, json.load(baseline_file), args.threshold)
+        print(json.dumps({'comparison': report, 'regressions': regressions}, indent=2))
+        sys.exit(1 if regressions else 0)
+    print(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
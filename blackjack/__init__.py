@@ -1,8 +1,33 @@
+import importlib
 from .constants import *
-from .assets import *
-from .utils import *
 from .card import Card
 from .deck import Deck
+from .hand import Hand
 from .player import Player
-from .slider import Slider
-from .game import Game
\ No newline at end of file
+from .engine import RoundEngine
+from .strategy import BasicStrategy, load_strategy
+from .solver import CompositionSolver
+
+# The rest needs pygame, so it is imported on first use. Headless code (RoundEngine,
+# simulations) can import the package without loading pygame, images or the display.
+_lazy_exports = {
+    'card_images': 'assets',
+    'get_background_image': 'assets',
+    'load_card_images': 'assets',
+    'preload_images': 'assets',
+    'resource_path': 'assets',
+    'data_path': 'assets',
+    'scale_image': 'utils',
+    'SurfaceCache': 'surface_cache',
+    'card_surfaces': 'surface_cache',
+    'Slider': 'slider',
+    'DirtyRenderer': 'renderer',
+    'TextCache': 'text_cache',
+    'Game': 'game',
+}
+
+def __getattr__(name):
+    module_name = _lazy_exports.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f'.{module_name}', __name__), name)
@@ -0,0 +1,70 @@
+# asset_pack.py
+#
+# Pre-decoded image bundle: one file with an index followed by raw pixel data, so card images
+# can be mapped straight into surfaces without PNG decoding. Build it with
+#     python -m blackjack.asset_pack
+# from the directory that holds Images/.
+
+import mmap
+import struct
+import pygame
+
+PACK_MAGIC = b'BJPK'
+PACK_VERSION = 1
+HEADER = struct.Struct('<4sHH')  # magic, version, entry count
+ENTRY = struct.Struct('<32s4sHHQ')  # name, pixel format, width, height, data offset
+DATA_ALIGNMENT = 64
+
+class AssetPack:
+    """ Read-only view of a packed asset bundle, image pixels are paged in by the OS on first use """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        # Copy-on-write mapping: surfaces share the file pages and a stray write can't corrupt the pack
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, count = HEADER.unpack_from(self.data, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a version {PACK_VERSION} asset pack")
+
+        self.index = {}  # name -> (pixel format, (width, height), offset)
+        for i in range(count):
+            name, pixel_format, width, height, offset = ENTRY.unpack_from(self.data, HEADER.size + i * ENTRY.size)
+            self.index[name.rstrip(b'\0').decode()] = (pixel_format.rstrip(b'\0').decode(), (width, height), offset)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def load(self, name):
+        # Wrap the mapped pixels in a surface without copying or decoding
+        pixel_format, size, offset = self.index[name]
+        length = size[0] * size[1] * len(pixel_format)
+        return pygame.image.frombuffer(memoryview(self.data)[offset:offset + length], size, pixel_format)
+
+def build_pack(images, path):
+    # images is a {name: surface} dict, written as RGBA (or RGB for opaque images) in one file
+    entries = []
+    blobs = []
+    offset = HEADER.size + len(images) * ENTRY.size
+    for name, surface in images.items():
+        pixel_format = 'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB'
+        offset += -offset % DATA_ALIGNMENT
+        pixels = pygame.image.tobytes(surface, pixel_format)
+        entries.append(ENTRY.pack(name.encode(), pixel_format.encode(), *surface.get_size(), offset))
+        blobs.append((offset, pixels))
+        offset += len(pixels)
+
+    with open(path, 'wb') as pack_file:
+        pack_file.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, len(images)))
+        for entry in entries:
+            pack_file.write(entry)
+        for blob_offset, pixels in blobs:
+            pack_file.write(b'\0' * (blob_offset - pack_file.tell()))
+            pack_file.write(pixels)
+
+if __name__ == '__main__':
+    from .assets import IMAGE_FILES, decode_image, resource_path, PACK_PATH
+    build_pack({name: decode_image(name) for name in IMAGE_FILES}, resource_path(PACK_PATH))
+    print(f"Wrote {len(IMAGE_FILES)} images to {resource_path(PACK_PATH)}")
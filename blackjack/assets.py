@@ -1,12 +1,24 @@
 import pygame
 import os
 from .constants import suits, values
+from .asset_pack import AssetPack
+from .utils import display_format
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-pygame.init()
+# Image files by name: the card back, the table and every card face
+IMAGE_FILES = {'red_back': 'red_back.png', 'table': 'table.jpg'}
+IMAGE_FILES.update({f'{value}_of_{suit}': f'{value}_of_{suit}.png' for suit in suits for value in values})
+
+# Images the betting screen needs, the game can start once these are loaded
+BETTING_IMAGES = ('table', 'red_back')  # Game builds its table layer with the deck back
+
+# Pre-decoded bundle built by `python -m blackjack.asset_pack`, PNGs are used when it's missing
+PACK_PATH = os.path.join('Images', 'assets.pack')
 
-card_images = {}
 background_image = None
+asset_pack = None
+pending_images = {}  # name -> future of a preload_images load still running
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -16,18 +28,78 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def load_card_images():
+def data_path(relative_path):
+    """ Get absolute path to a file the game writes, next to the executable in a PyInstaller build """
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)  # _MEIPASS is a temp dir removed on exit
+    else:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+def decode_image(name):
+    return pygame.image.load(resource_path(os.path.join('Images', IMAGE_FILES[name])))
+
+def load_image(name):
+    # Prefer the mapped pack (no decoding), fall back to the original image file
+    global asset_pack
+    if asset_pack is None and os.path.exists(resource_path(PACK_PATH)):
+        asset_pack = AssetPack(resource_path(PACK_PATH))
+    if asset_pack is not None and name in asset_pack:
+        return display_format(asset_pack.load(name))
+    return display_format(decode_image(name))
+
+def wait_or_load(name):
+    # Wait for a preload already decoding this image rather than decoding it a second time
+    future = pending_images.get(name)
+    return future.result() if future is not None else load_image(name)
+
+class CardImages(dict):
+    """ Card images keyed like 'ace_of_spades' or 'red_back', each loaded on first use """
+
+    def __missing__(self, name):
+        return self.setdefault(name, wait_or_load(name))
+
+card_images = CardImages()
+
+def get_background_image():
+    global background_image
+    if background_image is None:
+        background_image = wait_or_load('table')
+    return background_image
+
+def preload_image(name):
+    # Pool task: load an image and store it where Game looks for it
     global background_image
-    
-    # Load the card back and background image
-    card_images['red_back'] = pygame.image.load(resource_path('Images/red_back.png'))
-    background_image = pygame.image.load(resource_path('Images/table.jpg'))
-
-    # Load all card images based on suits and values
-    for suit in suits:
-        for value in values:
-            image_filename = f'{value}_of_{suit}.png'
-            card_images[f'{value}_of_{suit}'] = pygame.image.load(resource_path(f'Images/{image_filename}'))
-
-# Call the function to load the images
-load_card_images()
+    image = load_image(name)
+    if name == 'table':
+        if background_image is None:
+            background_image = image
+    else:
+        card_images.setdefault(name, image)
+    return image
+
+def image_cost(name):
+    # File size as a stand-in for decode time (face cards are several times larger than pip cards)
+    path = resource_path(os.path.join('Images', IMAGE_FILES[name]))
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+def preload_images(workers=None):
+    # Start loading every image on a thread pool (decoding releases the GIL), returns {name: future}.
+    # The betting screen's images go first, then the largest files so the slowest decodes don't end up last.
+    executor = ThreadPoolExecutor(workers, thread_name_prefix='assets')
+    names = list(BETTING_IMAGES) + sorted((name for name in IMAGE_FILES if name not in BETTING_IMAGES), key=image_cost, reverse=True)
+    futures = {}
+    for name in names:
+        futures[name] = pending_images[name] = executor.submit(preload_image, name)
+        # Forget the future once the image is stored, so the surface cache can still drop the source
+        futures[name].add_done_callback(lambda _, name=name: pending_images.pop(name, None))
+    executor.shutdown(wait=False)  # Worker threads exit once the queue is done
+    return futures
+
+def load_card_images(workers=None, progress=None):
+    # Load everything up front, progress(done, total) is called as each image finishes
+    futures = preload_images(workers)
+    for done, future in enumerate(as_completed(futures.values()), 1):
+        future.result()
+        if progress is not None:
+            progress(done, len(futures))
@@ -0,0 +1,95 @@
+# autoplay.py
+#
+# Turbo mode for Game: a policy plays rounds back to back with no dealer timer, the screen is only
+# drawn every draw_every rounds (0 for never), and every settled round is checked for balance and
+# state errors. Bot rounds stay out of the hand history and the player's session statistics, they
+# go to the AutoPlay's own SessionStats, and Game gives the player's balance back when it stops.
+# Toggle in game with F5 between rounds, or start with BLACKJACK_AUTOPLAY=<draw every N rounds>.
+
+import os
+import time
+from .policies import HitBelow
+from .stats import SessionStats
+
+AUTOPLAY_ENV = 'BLACKJACK_AUTOPLAY'
+DEFAULT_DRAW_EVERY = 100
+
+class AutoPlayError(RuntimeError):
+    """ A settled round broke one of the game's invariants """
+
+def expected_outcome(engine):
+    # Outcome and payout (including the returned bet) recomputed from the final hands
+    bet = engine.player.bet
+    player_total = engine.player.hand.total
+    dealer_total = engine.dealer.hand.total
+    if player_total > 21:
+        return "Bust! You lose.", 0
+    if dealer_total > 21:
+        return "Dealer busts! You win!", bet * 2
+    if player_total > dealer_total:
+        return "You win!", bet * 2
+    if player_total == dealer_total:
+        return "Push! It's a tie.", bet
+    return "You lose.", 0
+
+class AutoPlay:
+    """ Plays Game's rounds with a policy instead of the slider and buttons """
+
+    def __init__(self, policy=None, draw_every=DEFAULT_DRAW_EVERY, slice_seconds=0.05):
+        self.policy = policy or HitBelow(17)  # policy(hand, upcard, bankroll) -> (action, bet)
+        self.stats = SessionStats()
+        self.draw_every = draw_every
+        self.slice_seconds = slice_seconds  # Rounds played between event checks
+        self.rounds = 0
+        self.started = time.perf_counter()
+
+    def play_round(self, game):
+        # Play one round to GAME_OVER (finishing one already under way), check it and start the next
+        engine = game.engine
+        if engine.state == "GAME_ENDED":
+            game.restart_game()
+        balance = engine.player.balance if engine.state == "BETTING" else None
+        if not engine.play_hand(self.policy):  # Dealer draws straight away, no DEALER_HIT_EVENT
+            raise AutoPlayError(f"round {self.rounds}: bet refused in {engine.state} with balance {engine.player.balance}")
+        if engine.state != "GAME_OVER":
+            raise AutoPlayError(f"round stopped in {engine.state}")
+        if balance is not None:
+            self.check(engine, balance)
+        game.reset_game()
+        if engine.state not in ("BETTING", "GAME_ENDED"):
+            raise AutoPlayError(f"next round started in {engine.state}")
+        self.rounds += 1
+
+    def check(self, engine, balance):
+        outcome, payout = expected_outcome(engine)
+        if engine.outcome != outcome:
+            raise AutoPlayError(f"round {self.rounds}: outcome {engine.outcome!r}, expected {outcome!r}")
+        if engine.player.balance != balance - engine.player.bet + payout:
+            raise AutoPlayError(f"round {self.rounds}: balance {engine.player.balance}, "
+                                f"expected {balance - engine.player.bet + payout}")
+
+    def run_slice(self, game):
+        # Play rounds for up to slice_seconds, returns True if the screen should be redrawn
+        deadline = time.perf_counter() + self.slice_seconds
+        draw = False
+        while time.perf_counter() < deadline:
+            self.play_round(game)
+            if self.draw_every and self.rounds % self.draw_every == 0:
+                draw = True
+        return draw
+
+    def rounds_per_second(self):
+        elapsed = time.perf_counter() - self.started
+        return self.rounds / elapsed if elapsed else 0.0
+
+def autoplay_requested():
+    # Draw interval from BLACKJACK_AUTOPLAY (0 never draws), None when it isn't set;
+    # a value that isn't a non-negative number uses the default interval
+    value = os.environ.get(AUTOPLAY_ENV, '').strip()
+    if not value:
+        return None
+    try:
+        draw_every = int(value)
+    except ValueError:
+        return DEFAULT_DRAW_EVERY
+    return draw_every if draw_every >= 0 else DEFAULT_DRAW_EVERY
@@ -1,14 +1,21 @@
-import pygame
-from .assets import card_images
-from .utils import scale_image
+from .constants import suits, values
+
+# Cards are encoded as suit index * 13 + value index, so a deck is the codes 0..51
+DECK_SIZE = len(suits) * len(values)
+CARD_NAMES = [(value, suit) for suit in suits for value in values]
+CARD_CODES = {name: code for code, name in enumerate(CARD_NAMES)}
 
 class Card:
-    def __init__(self, value, suit, card_size):
+    def __init__(self, value, suit):
         self.value = value
         self.suit = suit
         self.face_up = True
-        self.base_image = card_images[f'{value}_of_{suit}']
-        self.image = scale_image(self.base_image, *card_size)
+        self.image_key = f'{value}_of_{suit}'
+        self.code = CARD_CODES[(value, suit)]
+
+    @classmethod
+    def from_code(cls, code):
+        return cls(*CARD_NAMES[code])
 
     def get_value(self):
         if self.value in ['jack', 'queen', 'king']:
@@ -19,9 +26,10 @@ class Card:
             return int(self.value)
 
     def draw_card(self, screen, position, card_size):
-        # Draw the card on the screen at the given position
+        # Draw the card on the screen at the given position, scaled surfaces are shared.
+        # Imported here so headless code using Card never loads pygame.
+        from .surface_cache import card_surfaces
         if self.face_up:
-            screen.blit(self.image, position)
+            screen.blit(card_surfaces.get(self.image_key, card_size), position)
         else:
-            back_image = scale_image(card_images['red_back'], *card_size)
-            screen.blit(back_image, position)
+            screen.blit(card_surfaces.get('red_back', card_size), position)
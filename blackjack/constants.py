@@ -23,5 +23,22 @@ BUTTON_Y_SPACING_RATIO = 0.02
 # Starting balance
 starting_balance = 10000
 
+# Shoe: number of decks, and reshuffle when fewer cards than this remain or after this many rounds
+DECKS_IN_SHOE = 1
+RESHUFFLE_REMAINING = 15
+RESHUFFLE_ROUNDS = 10
+
 # Custom event for dealer hitting
-DEALER_HIT_EVENT = 25 
+DEALER_HIT_EVENT = 25
+SOLVER_EVENT = 26  # Posted from the worker thread when shoe EVs are ready
+
+# Frame rate cap while something is animating, static screens block on events instead
+FRAME_RATE = 60
+
+# Window resizing: a drag is applied once the size stopped changing for RESIZE_SETTLE_MS,
+# scaled surfaces for the CACHED_SIZES most recent sizes are kept for reuse
+RESIZE_SETTLE_MS = 150
+CACHED_SIZES = 3
+
+# Bytes of card art (sources, downscaled tiers and scaled surfaces) kept resident
+TEXTURE_BUDGET = 40 * 1024 * 1024
@@ -1,15 +1,67 @@
 import random
-from .constants import suits, values
-from .card import Card
+from array import array
+from .constants import DECKS_IN_SHOE, RESHUFFLE_REMAINING
+from .card import Card, DECK_SIZE
 
 class Deck:
-    def __init__(self, card_size):
-        # Create a full deck of cards
-        self.cards = [Card(value, suit, card_size) for suit in suits for value in values]
-        random.shuffle(self.cards)
-    
+    """ Shoe of one or more decks stored as card codes, reshuffled in place or swapped for a prepared one """
+
+    def __init__(self, num_decks=DECKS_IN_SHOE, penetration=None, rng=random):
+        self.num_decks = num_decks
+        self.rng = rng  # Anything with shuffle(), e.g. the random module or a seeded random.Random
+        self.codes = array('B', range(DECK_SIZE)) * num_decks
+        self.position = 0  # Index of the next card to deal
+        self.shuffle_count = 0  # Bumped on every reshuffle so observers can tell shoes apart
+        self.next_codes = None  # Next shoe, shuffled ahead of time by prepare_next
+
+        # Cut card: reshuffle once this many cards are dealt, by default when fewer than
+        # RESHUFFLE_REMAINING are left (so a round always has enough)
+        last_cut = len(self.codes) - RESHUFFLE_REMAINING + 1
+        if penetration is None:
+            self.cut_card = last_cut
+        else:
+            self.cut_card = min(int(len(self.codes) * penetration), last_cut)
+        self.shuffle()
+
+    def prepare_next(self):
+        # Shuffle the next shoe now (e.g. on a worker thread) so shuffle() only has to swap it in
+        codes = array('B', self.codes)
+        self.rng.shuffle(codes)
+        self.next_codes = codes
+
+    def shuffle(self):
+        # Swap in a prepared shoe, or permute the same array in place; no cards are rebuilt
+        codes, self.next_codes = self.next_codes, None
+        if codes is not None:
+            self.codes = codes
+        else:
+            self.rng.shuffle(self.codes)
+        self.position = 0
+        self.shuffle_count += 1
+
+    def load(self, codes):
+        # Deal a given shoe from the top, e.g. the same shuffled shoe on several engines
+        self.codes = array('B', codes)
+        self.position = 0
+
+    def needs_shuffle(self):
+        return self.position >= self.cut_card
+
+    def deal_code(self):
+        code = self.codes[self.position]
+        self.position += 1
+        return code
+
     def deal_card(self):
-        return self.cards.pop()
-    
+        return Card.from_code(self.deal_code())
+
+    @property
+    def cards(self):
+        # Remaining cards in dealing order (the next card to deal is first)
+        return [Card.from_code(code) for code in self.codes[self.position:]]
+
+    def __len__(self):
+        return len(self.codes) - self.position
+
     def __iter__(self):
         return iter(self.cards)
@@ -0,0 +1,183 @@
+# engine.py
+
+import random
+from .constants import starting_balance, DECKS_IN_SHOE, RESHUFFLE_ROUNDS
+from .deck import Deck
+from .player import Player
+
+# States the engine advances through on its own (no player input needed)
+AUTOMATIC_STATES = ("DEALING", "DEALER_TURN", "DEALER_HITTING")
+
+class RoundEngine:
+    """ Pure-Python round logic, driven by Game for the GUI or run headless """
+
+    def __init__(self, balance=starting_balance, num_decks=DECKS_IN_SHOE, penetration=None,
+                 reshuffle_rounds=RESHUFFLE_ROUNDS, rng=random):
+        self.deck = Deck(num_decks, penetration, rng)
+        self.reshuffle_rounds = reshuffle_rounds  # None to only reshuffle at the cut card
+        self.player = Player("Player", balance)
+        self.dealer = Player("Dealer", starting_balance)
+        self.state = "BETTING"
+        self.round_count = 0
+
+        # Round flags
+        self.player_busted = False
+        self.dealer_busted = False
+        self.outcome = None
+        self.outcome_processed = False
+        self.bet_amount = 0
+
+        self.recorder = None  # Optional HandHistoryWriter, gets every settled round
+        self.stats = None  # Optional SessionStats, likewise
+
+    def place_bet(self, amount):
+        if self.state != "BETTING":
+            return False
+        amount = int(amount)
+        if amount >= 1 and amount <= self.player.balance:
+            self.player.place_bet(amount)
+            self.bet_amount = amount
+            self.state = "DEALING"
+            return True
+        return False
+
+    def hit(self):
+        if self.state != "PLAYER_TURN":
+            return False
+        self.player.add_card(self.deck.deal_card())
+        if self.player.hand.is_bust:
+            self.player_busted = True
+            self.finish_round()
+        return True
+
+    def stand(self):
+        if self.state != "PLAYER_TURN":
+            return False
+        self.state = "DEALER_TURN"
+        return True
+
+    def step(self):
+        # Advance one automatic transition, returns False if input is needed instead
+        if self.state == "DEALING":
+            # Deal initial cards
+            self.player.add_card(self.deck.deal_card())
+            self.player.add_card(self.deck.deal_card())
+            self.dealer.add_card(self.deck.deal_card())
+            self.dealer.add_card(self.deck.deal_card())
+            self.dealer.hand[1].face_up = False  # Hide one of dealer's cards
+            self.state = "PLAYER_TURN"
+            self.outcome_processed = False
+        elif self.state == "DEALER_TURN":
+            # Reveal dealer's hidden card
+            self.dealer.hand[1].face_up = True
+            self.state = "DEALER_HITTING"
+        elif self.state == "DEALER_HITTING":
+            # One dealer hit, the GUI spaces these out with DEALER_HIT_EVENT
+            if self.dealer.hand.total < 17:
+                self.dealer.add_card(self.deck.deal_card())
+            else:
+                if self.dealer.hand.is_bust:
+                    self.dealer_busted = True
+                self.finish_round()
+        else:
+            return False
+        return True
+
+    def advance(self):
+        # Run automatic transitions until the round needs a decision or is over
+        while self.state in AUTOMATIC_STATES:
+            self.step()
+
+    def finish_round(self):
+        self.state = "GAME_OVER"
+        self.outcome_processed = False
+        self.process_outcome()
+        if self.recorder is not None:
+            self.recorder.record(self)
+        if self.stats is not None:
+            self.stats.record(self)
+
+    def process_outcome(self):
+        if not self.outcome_processed:
+            # Determine the outcome
+            if self.player_busted:
+                self.outcome = "Bust! You lose."
+                # Player already lost the bet amount when placing the bet
+            elif self.dealer_busted:
+                self.outcome = "Dealer busts! You win!"
+                self.player.add_cash(self.player.bet * 2)  # Win amount equal to the bet
+            else:
+                player_total = self.player.get_total()
+                dealer_total = self.dealer.get_total()
+
+                if player_total > dealer_total:
+                    self.outcome = "You win!"
+                    self.player.add_cash(self.player.bet * 2)  # Win amount equal to the bet
+                elif player_total == dealer_total:
+                    self.outcome = "Push! It's a tie."
+                    self.player.add_cash(self.player.bet)  # Return the bet amount
+                else:
+                    self.outcome = "You lose."
+                    # Player already lost the bet amount when placing the bet
+
+            self.outcome_processed = True  # Set the flag to prevent re-processing
+
+    def reshuffle_due(self):
+        # Whether next_round() will reshuffle: the cut card came out or enough rounds passed
+        return self.deck.needs_shuffle() or bool(self.reshuffle_rounds and self.round_count + 1 >= self.reshuffle_rounds)
+
+    def next_round(self):
+        # Clear hands and reshuffle when needed, returns True if the deck was reshuffled
+        self.player.reset_hand()
+        self.dealer.reset_hand()
+
+        reshuffled = self.reshuffle_due()
+
+        # Increment round count
+        self.round_count += 1
+
+        if reshuffled:
+            self.deck.shuffle()
+            self.round_count = 0
+
+        self.player_busted = False
+        self.dealer_busted = False
+        self.bet_amount = 0
+        self.outcome_processed = False
+
+        if self.player.balance < 1:
+            self.state = "GAME_ENDED"
+        else:
+            self.state = "BETTING"
+        return reshuffled
+
+    def restart(self):
+        # Start over with a fresh balance after running out of cash
+        self.next_round()
+        self.player.balance = starting_balance
+        self.state = "BETTING"
+
+    def play_hand(self, policy):
+        # Play to GAME_OVER with a policy(hand, upcard, bankroll) -> (action, bet) (see policies.py),
+        # betting first when in BETTING (capped at the balance). Returns False if the bet was refused.
+        if self.state == "BETTING":
+            _, bet = policy(None, None, self.player.balance)
+            if not self.place_bet(min(int(bet), self.player.balance)):
+                return False
+        self.advance()
+        while self.state == "PLAYER_TURN":
+            action, _ = policy(self.player.hand, self.dealer.hand[0], self.player.balance)
+            if action == "hit":
+                self.hit()
+            else:
+                self.stand()
+                self.advance()
+        return True
+
+    def play_round(self, policy):
+        # Play one full round headless and move on to the next, returns the outcome (None if no bet)
+        if not self.play_hand(policy):
+            return None
+        outcome = self.outcome
+        self.next_round()
+        return outcome
@@ -1,44 +1,31 @@
 # game.py
 
 import pygame
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from .constants import *
-from .utils import scale_image
-from .deck import Deck
-from .player import Player
+from .engine import RoundEngine
 from .slider import Slider
-from .assets import card_images, background_image
-import os
-import sys
-
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
-    try:
-        base_path = sys._MEIPASS
-    except AttributeError:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
-
-# Determine if we are running as a frozen executable
-if getattr(sys, 'frozen', False):
-    # Running in a PyInstaller bundle
-    base_path = sys._MEIPASS
-else:
-    # Running in a normal Python environment
-    base_path = os.path.dirname(__file__)
-
-# Load the game window icon using the relative path
-icon_path = resource_path(os.path.join('Images', 'logo.png'))
-icon = pygame.image.load(icon_path)
-
-# Set the icon for the game window
-pygame.display.set_icon(icon)
+from .renderer import DirtyRenderer
+from .text_cache import TextCache
+from .assets import get_background_image, data_path
+from .utils import display_format
+from .surface_cache import card_surfaces
+from .strategy import load_strategy
+from .solver import CompositionSolver
+from .history import HandHistoryWriter, HISTORY_PATH
+from .profiler import FrameProfiler, profiler_requested, TOGGLE_KEY, DUMP_KEY
+from .autoplay import AutoPlay, autoplay_requested
+from .policies import StrategyPolicy
+from .shoe_prep import ShoePreparer
+from .stats import SessionStats
 
 class Game:
-    def __init__(self, screen):
+    def __init__(self, screen, record_history=True, threaded_prep=True):
+        # record_history=False never opens the hand history (benchmarks, replays), threaded_prep=False
+        # prepares shoes and solves shoe EVs on the calling thread instead of workers
         self.screen = screen
         self.running = True
-        self.game_state = "BETTING"
-        self.round_count = 0
 
         # Screen properties
         self.SCREEN_WIDTH, self.SCREEN_HEIGHT = screen.get_size()
@@ -46,22 +33,40 @@ class Game:
         # Calculate initial CARD_SIZE
         self.CARD_SIZE = (int(self.SCREEN_WIDTH * CARD_WIDTH_RATIO), int(self.SCREEN_HEIGHT * CARD_HEIGHT_RATIO))
 
-        # Font
+        # Font, rendered strings are cached so text is only rasterized when it changes
+        self.text_cache = TextCache()
+        self.font_name = 'Consolas'  # Using 'Consolas' as monospaced font
         self.font_size = int(self.SCREEN_HEIGHT * 0.035 * 0.9)  # Reduced by 10%
-        self.mono_font = pygame.font.SysFont('Consolas', self.font_size)  # Using 'Consolas' as monospaced font
 
-        # Initialize deck and players
-        self.deck = Deck(self.CARD_SIZE)
-        self.player = Player("Player", starting_balance)
-        self.dealer = Player("Dealer", starting_balance)
+        # Round logic (deck, players, state machine) lives in the engine
+        self.engine = RoundEngine()
 
-        # Initialize flags
-        self.player_busted = False
-        self.dealer_busted = False
-        self.outcome_processed = False
+        # Every settled round is appended to the hand history for audits. A writer thread writes and
+        # syncs each hand as it settles, so a crash doesn't lose the session and frames never wait on the disk
+        if record_history:
+            self.engine.recorder = HandHistoryWriter(data_path(HISTORY_PATH), sync=True, background=True)
 
-        # Betting variables
-        self.bet_amount = 0
+        # Running session statistics in constant memory, F6 shows a summary and F7 exports it to JSON
+        self.engine.stats = SessionStats(self.engine.player.balance)
+        self.show_stats = False
+        self.stats_font = None
+        self.notice = None  # Where the last F7/F10 export went, shown until the next key press or click
+
+        # The next shoe is shuffled and its card surfaces scaled on a worker thread, a reshuffle just swaps it in
+        self.shoe_preparer = ShoePreparer(threaded_prep)
+        self.shoe_preparer.prepare(self.engine.deck, self.CARD_SIZE)
+
+        # Precomputed basic strategy for the "recommended action" hint, looked up in O(1) per frame
+        self.strategy = load_strategy()
+
+        # Strategy hint and shoe EVs under the buttons (off for replays, whose deck isn't the live shoe)
+        self.show_hints = True
+
+        # Exact EVs against the cards left in the shoe, solved on a worker of their own so a long solve never
+        # holds up the next shoe. The next round's first decision is solved while the player bets.
+        self.solver = CompositionSolver()
+        self.solver_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='solver') if threaded_prep else None
+        self.solves = {}  # (shuffle_count, position) -> future, for the decision on screen or the coming deal
 
         # Initialize buttons
         self.hit_button_rect, self.stand_button_rect = self.create_buttons()
@@ -69,16 +74,61 @@ class Game:
         # Initialize slider
         self.bet_slider = self.create_slider()
 
-        # Scale the back card image for the deck representation
-        self.back_card_image = scale_image(card_images['red_back'], *self.CARD_SIZE)
+        # Shared scaled back card image for the deck representation
+        self.back_card_image = card_surfaces.get('red_back', self.CARD_SIZE)
 
         # Calculate deck position
         self.deck_x = self.SCREEN_WIDTH - self.CARD_SIZE[0] - int(self.SCREEN_WIDTH * 0.1)  # Adjusted to 10% from the right edge
         self.deck_y = (self.SCREEN_HEIGHT - self.CARD_SIZE[1]) // 2  # Centered vertically
         self.deck_position = (self.deck_x, self.deck_y)
 
-        # Scale background image
-        self.background_image = pygame.transform.scale(background_image, (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        # Scale background image, kept per size so returning to a recent size doesn't rescale
+        self.backgrounds = OrderedDict()
+        self.background_image = self.get_background((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+
+        # Window drags are coalesced: only the latest size is applied, once it settles
+        self.pending_size = None
+        self.resize_time = 0
+        self.resize_preview = None  # Copy of the last full frame, stretched over the window meanwhile
+        self.preview_size = None
+
+        # Background with the deck stack composited in, the bottom layer once a round is dealt
+        self.table_layer = self.build_table_layer()
+
+        # Only regions that changed since the last frame are redrawn and pushed to the display
+        self.renderer = DirtyRenderer(self.screen, self.background_image)
+
+        # Frame timings and HUD, off unless BLACKJACK_PROFILE is set or F3 is pressed
+        self.profiler = FrameProfiler(self)
+        if profiler_requested():
+            self.profiler.enable()
+
+        # Turbo auto-play, off unless BLACKJACK_AUTOPLAY is set or F5 is pressed
+        self.autoplay = None
+        self.player_hooks = None  # Hand history, session stats and balance, set aside while auto-play runs
+        draw_every = autoplay_requested()
+        if draw_every is not None:
+            self.start_autoplay(draw_every)
+
+    @property
+    def game_state(self):
+        return self.engine.state
+
+    @property
+    def deck(self):
+        return self.engine.deck
+
+    @property
+    def player(self):
+        return self.engine.player
+
+    @property
+    def dealer(self):
+        return self.engine.dealer
+
+    @property
+    def outcome(self):
+        return self.engine.outcome
 
     def create_buttons(self):
         button_width = int(self.SCREEN_WIDTH * BUTTON_WIDTH_RATIO)
@@ -139,10 +189,29 @@ class Game:
         return (x, y)
 
     def handle_events(self, event):
+        if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+            self.notice = None
         if event.type == pygame.QUIT:
             self.running = False
         elif event.type == pygame.VIDEORESIZE:
-            self.handle_resize(event.size)
+            self.queue_resize(event.size)
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.renderer.invalidate()  # Window contents were lost, repaint everything
+        elif event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.profiler.toggle()
+        elif event.type == pygame.KEYDOWN and event.key == DUMP_KEY and self.profiler.enabled:
+            self.notice = f"Wrote frame profile to {self.profiler.dump()}"
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5:  # Toggle auto-play
+            if self.autoplay is None and self.game_state != "BETTING":
+                self.notice = "Auto-play starts between rounds"  # Never takes over the player's live bet
+            elif self.autoplay is None:
+                self.start_autoplay()
+            else:
+                self.stop_autoplay()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F6:  # Toggle the statistics summary
+            self.show_stats = not self.show_stats
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F7:
+            self.notice = f"Wrote session statistics to {self.engine.stats.dump()}"
         elif self.game_state == "BETTING":
             # Handle slider events (mouse dragging)
             self.bet_slider.handle_event(event)
@@ -155,10 +224,7 @@ class Game:
                     self.bet_slider.update_with_arrows(pygame.K_RIGHT)  # Move slider right
                 elif event.key == pygame.K_RETURN:
                     # Confirm the bet when Enter is pressed
-                    self.bet_amount = int(self.bet_slider.value)
-                    if self.bet_amount >= 1 and self.bet_amount <= self.player.balance:
-                        self.player.place_bet(self.bet_amount)
-                        self.game_state = "DEALING"
+                    self.engine.place_bet(self.bet_slider.value)
         elif self.game_state == "GAME_OVER":
             if event.type == pygame.MOUSEBUTTONDOWN:
                 # Reset the game
@@ -171,78 +237,87 @@ class Game:
                 self.running = False  # Exit the game
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:  # Restart the game if "R" is pressed
-                    self.reset_game()
-                    self.player.balance = 10000  # Reset the balance
-                    self.bet_slider.max_val = self.player.balance  # Update the slider's max value
-                    self.bet_slider.value = 100  # Reset the bet value to 100
-                    self.bet_slider.update_handle_position()  # Update the slider handle position
-                    self.game_state = "BETTING"  # Reset to betting state
+                    self.restart_game()
         elif self.game_state == "PLAYER_TURN":
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = event.pos  # Get the mouse position
                 if self.hit_button_rect.collidepoint(mouse_pos):
                     # Player chooses to "Hit"
-                    self.player.add_card(self.deck.deal_card())
-                    if self.player.get_total() > 21:
-                        self.player_busted = True
-                        self.game_state = "GAME_OVER"
-                        self.outcome_processed = False
+                    self.engine.hit()
                 elif self.stand_button_rect.collidepoint(mouse_pos):
                     # Player chooses to "Stand"
-                    self.game_state = "DEALER_TURN"
+                    self.engine.stand()
 
         elif event.type == DEALER_HIT_EVENT and self.game_state == "DEALER_HITTING":
-            if self.dealer.get_total() < 17:
-                self.dealer.add_card(self.deck.deal_card())
-            else:
+            self.engine.step()
+            if self.game_state != "DEALER_HITTING":
                 pygame.time.set_timer(DEALER_HIT_EVENT, 0)  # Stop the timer
-                if self.dealer.get_total() > 21:
-                    self.dealer_busted = True
-                self.game_state = "GAME_OVER"
-                self.outcome_processed = False
 
     def handle_resize(self, size):
         self.SCREEN_WIDTH, self.SCREEN_HEIGHT = size
         self.screen = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT), pygame.RESIZABLE)
         # Recalculate CARD_SIZE
         self.CARD_SIZE = (int(self.SCREEN_WIDTH * CARD_WIDTH_RATIO), int(self.SCREEN_HEIGHT * CARD_HEIGHT_RATIO))
-        # Rescale images
-        self.background_image = pygame.transform.scale(background_image, (self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
-        for card in self.deck.cards + self.player.hand + self.dealer.hand:
-            card.image = scale_image(card.base_image, *self.CARD_SIZE)
+        # Rescale the background, cards pick up the new size from card_surfaces when drawn
+        self.background_image = self.get_background(size)
         # Recalculate buttons and fonts
         self.hit_button_rect, self.stand_button_rect = self.create_buttons()
-        self.font_size = int(self.SCREEN_HEIGHT * 0.035 * 0.9)  # Reduced by 10%
-        self.mono_font = pygame.font.SysFont('Consolas', self.font_size)
+        self.font_size = int(self.SCREEN_HEIGHT * 0.035 * 0.9)  # Reduced by 10%, text from recent sizes stays cached
         # Recalculate slider dimensions
         self.bet_slider = self.create_slider()
         # Recalculate deck position
         self.deck_x = self.SCREEN_WIDTH - self.CARD_SIZE[0] - int(self.SCREEN_WIDTH * 0.1)  # Adjusted to 10% from the right edge
         self.deck_y = (self.SCREEN_HEIGHT - self.CARD_SIZE[1]) // 2  # Centered vertically
         self.deck_position = (self.deck_x, self.deck_y)
-        # Rescale the back card image
-        self.back_card_image = scale_image(card_images['red_back'], *self.CARD_SIZE)
+        # Look up the back card image at the new size
+        self.back_card_image = card_surfaces.get('red_back', self.CARD_SIZE)
+        self.table_layer = self.build_table_layer()
+        self.shoe_preparer.prepare(self.engine.deck, self.CARD_SIZE)  # Card surfaces at the new size
+        # Repaint the whole new window on the next frame
+        self.renderer.reset(self.screen, self.background_image)
+
+    def get_background(self, size):
+        size = tuple(size)
+        background = self.backgrounds.get(size)
+        if background is None:
+            background = self.backgrounds[size] = display_format(pygame.transform.scale(get_background_image(), size))
+            while len(self.backgrounds) > CACHED_SIZES:
+                self.backgrounds.popitem(last=False)
+        else:
+            self.backgrounds.move_to_end(size)
+        return background
+
+    def queue_resize(self, size):
+        # Remember only the latest size of a drag, handle_resize runs once it stops changing
+        if self.pending_size is None and tuple(size) == (self.SCREEN_WIDTH, self.SCREEN_HEIGHT):
+            return  # Already laid out for this size
+        if self.pending_size is None:
+            self.resize_preview = self.screen.copy()
+        self.pending_size = tuple(size)
+        self.resize_time = pygame.time.get_ticks()
+
+    def update_resize(self):
+        # Apply a settled resize, or stretch the last frame over the window while the drag goes on
+        if self.pending_size is None:
+            return
+        if pygame.time.get_ticks() - self.resize_time >= RESIZE_SETTLE_MS:
+            size = self.pending_size
+            self.pending_size = self.resize_preview = self.preview_size = None
+            self.handle_resize(size)
+        elif self.preview_size != self.pending_size:
+            surface = pygame.display.get_surface()
+            surface.blit(pygame.transform.scale(self.resize_preview, surface.get_size()), (0, 0))
+            pygame.display.flip()
+            self.preview_size = self.pending_size
 
     def reset_game(self):
-        self.player.reset_hand()
-        self.dealer.reset_hand()
-
-        # Increment round count
-        self.round_count += 1
-
-        # Check if the deck is low on cards or if 5 rounds have passed
-        if len(self.deck.cards) < 15 or self.round_count >= 10:  # Reshuffle if deck is low or 10 rounds passed
-            self.deck = Deck(self.CARD_SIZE)  # Reshuffle the deck
-            self.round_count = 0  # Reset the round counter
-
+        # Clear hands, reshuffle if needed and move to BETTING or GAME_ENDED
+        if self.engine.next_round():
             # Optionally trigger a visual shuffle message (if you want to show the shuffle happened)
             self.shuffle_happened = True
             self.shuffle_display_time = pygame.time.get_ticks()
-
-        self.player_busted = False
-        self.dealer_busted = False
-        self.bet_amount = 0
-        self.outcome_processed = False
+            if self.autoplay is None:  # Turbo rounds reshuffle faster than a thread hand-off, shuffle in place
+                self.shoe_preparer.prepare(self.engine.deck, self.CARD_SIZE)
 
         # Update slider max value to current balance
         self.bet_slider.max_val = self.player.balance
@@ -251,47 +326,100 @@ class Game:
         # Update the slider's handle position to reflect the new value
         self.bet_slider.update_handle_position()
 
-        if self.player.balance < 1:
-            self.game_state = "GAME_ENDED"
-        else:
-            self.game_state = "BETTING"
+    def restart_game(self):
+        self.engine.restart()  # Reset the balance and go back to betting
+        if self.deck.next_codes is None and self.autoplay is None:
+            self.shoe_preparer.prepare(self.deck, self.CARD_SIZE)  # restart() may have used up the prepared shoe
+        self.bet_slider.max_val = self.player.balance  # Update the slider's max value
+        self.bet_slider.value = 100  # Reset the bet value to 100
+        self.bet_slider.update_handle_position()  # Update the slider handle position
+
+    def start_autoplay(self, draw_every=100):
+        # Only called in BETTING. The policy follows the basic strategy table and picks the bet, the dealer
+        # timer is replaced by engine.advance(). Bot rounds go to the auto-play's own stats, not the hand
+        # history or session, and play with a balance that stop_autoplay puts back.
+        pygame.time.set_timer(DEALER_HIT_EVENT, 0)
+        self.autoplay = AutoPlay(StrategyPolicy(self.strategy), draw_every=draw_every)
+        self.player_hooks = (self.engine.recorder, self.engine.stats, self.player.balance)
+        self.engine.recorder = None
+        self.engine.stats = self.autoplay.stats
+
+    def stop_autoplay(self):
+        # Bot rounds always stop between rounds, go back to betting with the player's own balance
+        self.notice = f"Auto-play: {self.autoplay.rounds} rounds at {self.autoplay.rounds_per_second():.0f}/s"
+        self.engine.recorder, self.engine.stats, self.player.balance = self.player_hooks
+        self.player_hooks = None
+        self.autoplay = None
+        self.engine.state = "BETTING"
+        if self.deck.next_codes is None:
+            self.shoe_preparer.prepare(self.deck, self.CARD_SIZE)
+        self.bet_slider.max_val = self.player.balance
+        self.bet_slider.value = min(self.bet_slider.value, self.player.balance)
+        self.bet_slider.update_handle_position()
 
     def game_logic(self):
         if self.game_state == "DEALING":
             # Deal initial cards
-            self.player.add_card(self.deck.deal_card())
-            self.player.add_card(self.deck.deal_card())
-            self.dealer.add_card(self.deck.deal_card())
-            self.dealer.add_card(self.deck.deal_card())
-            self.dealer.hand[1].face_up = False  # Hide one of dealer's cards
-            self.game_state = "PLAYER_TURN"
-            self.outcome_processed = False  # Reset the flag when dealing new cards
+            self.engine.step()
+
+        elif self.game_state in ("GAME_OVER", "BETTING") and self.show_hints:
+            self.presolve_deal()
 
         elif self.game_state == "DEALER_TURN":
             # Reveal dealer's hidden card
-            self.dealer.hand[1].face_up = True
+            self.engine.step()
             # Start dealer hitting process
             pygame.time.set_timer(DEALER_HIT_EVENT, 1000)  # 1000 milliseconds between hits
-            self.game_state = "DEALER_HITTING"
 
     def draw(self):
-        self.screen.blit(self.background_image, (0, 0))
+        self.renderer.begin_frame()
+        # The deck stack is part of the table layer, so each repaint starts with a single blit
+        self.renderer.set_background(self.background_image if self.game_state in ("BETTING", "GAME_ENDED") else self.table_layer)
         # Draw game elements based on the game state
         if self.game_state != "BETTING":
             self.draw_hands()
-            self.draw_deck()
         if self.game_state == "PLAYER_TURN":
             self.draw_buttons()
             self.draw_balance_and_bet()
         elif self.game_state == "BETTING":
             self.draw_betting()
         elif self.game_state == "GAME_OVER":
-            self.process_outcome()
             self.draw_game_over()
         elif self.game_state == "GAME_ENDED":
             self.draw_game_ended()
 
-        pygame.display.flip()  # Update the display
+        if self.autoplay is not None:
+            self.draw_text(f"Auto-play: {self.autoplay.rounds} rounds, {self.autoplay.rounds_per_second():.0f}/s",
+                           WHITE, topright=(self.SCREEN_WIDTH - 10, 10))
+        if self.show_stats:
+            self.draw_stats()
+        if self.notice is not None:
+            self.draw_text(self.notice, WHITE, bottomright=(self.SCREEN_WIDTH - 10, self.SCREEN_HEIGHT - 10))
+        if self.profiler.enabled:
+            self.profiler.draw_hud(self.renderer)
+        self.renderer.end_frame()  # Update only the changed parts of the display
+
+    def draw_text(self, text, color, **position):
+        # Look up cached text and hand it to the renderer, position is any get_rect keyword (center=, topleft=)
+        text_surface = self.text_cache.render(self.font_name, self.font_size, text, color)
+        text_rect = text_surface.get_rect(**position)
+        self.renderer.blit(text_surface, text_rect, key=('text', text, color, self.font_size))
+
+    def draw_stats(self):
+        # Session summary in the bottom-left corner, only redrawn when a settled hand changes its text
+        if self.stats_font is None:
+            self.stats_font = pygame.font.Font(None, 18)
+        lines = self.engine.stats.summary_lines()
+        line_height = self.stats_font.get_linesize()
+        width = max(self.stats_font.size(line)[0] for line in lines) + 12
+        height = line_height * len(lines) + 8
+        rect = pygame.Rect(8, self.SCREEN_HEIGHT - height - 8, width, height)
+
+        def draw(surface):
+            surface.fill(BLACK, rect)
+            for i, line in enumerate(lines):
+                surface.blit(self.stats_font.render(line, True, WHITE), (rect.x + 6, rect.y + 4 + i * line_height))
+        self.renderer.draw(('stats', lines), rect, draw)
 
     def draw_hands(self):
         # Draw dealer's hand
@@ -299,40 +427,36 @@ class Game:
         if total_dealer_cards > 0:  # Ensure dealer has cards
             for index, card in enumerate(self.dealer.hand):
                 position = self.get_card_position('dealer', index, total_dealer_cards)
-                card.draw_card(self.screen, position, self.CARD_SIZE)
+                card.draw_card(self.renderer, position, self.CARD_SIZE)
             # After drawing the dealer's cards, get the last card's position
             dealer_card_y = position[1]
 
             # Display dealer's hand total if dealer's cards are all face up
             if all(card.face_up for card in self.dealer.hand):
                 dealer_total = self.dealer.get_total()
-                dealer_total_text = self.mono_font.render(f"Dealer's Total: {dealer_total}", True, WHITE)
                 dealer_total_y = dealer_card_y + self.CARD_SIZE[1] + self.font_size * 0.5  # Adjust as needed for padding
-                dealer_total_rect = dealer_total_text.get_rect(center=(self.SCREEN_WIDTH // 2, dealer_total_y))
-                self.screen.blit(dealer_total_text, dealer_total_rect)
+                self.draw_text(f"Dealer's Total: {dealer_total}", WHITE, center=(self.SCREEN_WIDTH // 2, dealer_total_y))
 
         # Draw player's hand
         total_player_cards = len(self.player.hand)
         if total_player_cards > 0:  # Ensure player has cards
             for index, card in enumerate(self.player.hand):
                 position = self.get_card_position('player', index, total_player_cards)
-                card.draw_card(self.screen, position, self.CARD_SIZE)
+                card.draw_card(self.renderer, position, self.CARD_SIZE)
             # After drawing the player's cards, get the last card's position
             player_card_y = position[1]
-            
+
             # Display player's hand total above the player's hand
             player_total = self.player.get_total()
-            total_text = self.mono_font.render(f'Your Total: {player_total}', True, WHITE)
             total_y = player_card_y - self.font_size * 0.5  # Move it closer to the hand
-            total_rect = total_text.get_rect(center=(self.SCREEN_WIDTH // 2, total_y))
-            self.screen.blit(total_text, total_rect)
+            self.draw_text(f'Your Total: {player_total}', WHITE, center=(self.SCREEN_WIDTH // 2, total_y))
 
-            # Adjust the text to be closer to the player's hand
-            total_y = player_card_y - self.font_size * 0.5  # Move it closer to the hand
-            total_rect = total_text.get_rect(center=(self.SCREEN_WIDTH // 2, total_y))
-            self.screen.blit(total_text, total_rect)
+    def build_table_layer(self):
+        layer = self.background_image.copy()
+        self.draw_deck(layer)
+        return layer
 
-    def draw_deck(self):
+    def draw_deck(self, surface):
         # Draw the deck on the right side with overlapping back cards
         deck_card_count = 11
         vertical_offset_ratio = 0.05
@@ -341,80 +465,88 @@ class Game:
         for i in range(deck_card_count):
             offset = i * int(self.CARD_SIZE[0] * -0.01)  # 5% of card width
             deck_card_position = (self.deck_x - offset, vertical_offset + (offset//2))
-            self.screen.blit(self.back_card_image, deck_card_position)
+            surface.blit(self.back_card_image, deck_card_position)
 
     def draw_buttons(self):
         # Draw the buttons
-        pygame.draw.rect(self.screen, WHITE, self.hit_button_rect)
-        pygame.draw.rect(self.screen, WHITE, self.stand_button_rect)
-
-        # Render the text
-        hit_text = self.mono_font.render('Hit', True, BLACK)
-        stand_text = self.mono_font.render('Stand', True, BLACK)
+        for button_rect in (self.hit_button_rect, self.stand_button_rect):
+            self.renderer.draw(('button', tuple(button_rect)), button_rect,
+                               lambda surface, rect=button_rect: pygame.draw.rect(surface, WHITE, rect))
 
         # Center the text on the buttons
-        hit_text_rect = hit_text.get_rect(center=self.hit_button_rect.center)
-        stand_text_rect = stand_text.get_rect(center=self.stand_button_rect.center)
-
-        # Blit the text onto the buttons
-        self.screen.blit(hit_text, hit_text_rect)
-        self.screen.blit(stand_text, stand_text_rect)
+        self.draw_text('Hit', BLACK, center=self.hit_button_rect.center)
+        self.draw_text('Stand', BLACK, center=self.stand_button_rect.center)
+
+        if not self.show_hints:
+            return
+
+        # Basic strategy hint below the buttons
+        action = self.strategy.recommend_hand(self.player.hand, self.dealer.hand[0])
+        hint_y = self.stand_button_rect.bottom + self.font_size
+        self.draw_text(f'Recommended: {action.title()}', WHITE, midtop=(self.stand_button_rect.centerx, hint_y))
+
+        # Exact EVs for the current shoe composition, shown once the worker has solved them
+        evs = self.get_shoe_evs()
+        text = 'Solving EVs...' if evs is None else f'Hit {evs[1]:+.2f} / Stand {evs[2]:+.2f}'
+        self.draw_text(text, WHITE, midtop=(self.stand_button_rect.centerx, hint_y + self.font_size * 1.5))
+
+    def get_shoe_evs(self):
+        # EVs for the cards on screen, None until the solver worker has them (see CompositionSolver for timings)
+        key = (self.deck.shuffle_count, self.deck.position)
+        future = self.solves.get(key)
+        if future is None:
+            future = self.submit_solve(key, self.solver.snapshot(self.engine))
+        return future.result() if future.done() else None
+
+    def presolve_deal(self):
+        # Solve the first decision of the coming deal on the Game Over screen and while the bet is chosen,
+        # so its EVs are usually there when the cards land (the deal is the next four cards of the shoe)
+        if self.game_state == "GAME_OVER" and self.engine.reshuffle_due():
+            return  # The deal comes from a shoe that isn't in place yet, wait for BETTING
+        key = (self.deck.shuffle_count, self.deck.position + 4)
+        if key not in self.solves:
+            self.submit_solve(key, self.solver.deal_snapshot(self.deck))
+
+    def submit_solve(self, key, snapshot):
+        # Queue a solve and forget older ones, whose solves are skipped if they haven't started
+        self.solves = {key: None}
+        if self.solver_executor is None:
+            future = Future()
+            future.set_result(self.solver.solve(snapshot))
+        else:
+            future = self.solver_executor.submit(self.solve_shoe, key, snapshot)
+        self.solves[key] = future
+        return future
+
+    def solve_shoe(self, key, snapshot):
+        # Solver thread: skip solves the player has already moved past, wake the event loop when done
+        if key not in self.solves:
+            return None
+        result = self.solver.solve(snapshot)
+        if pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(SOLVER_EVENT))
+        return result
 
     def draw_balance_and_bet(self):
         # Display current balance and bet amount
-        balance_text = self.mono_font.render(f'Cash Money: ${self.player.balance}', True, WHITE)
-        balance_rect = balance_text.get_rect(topleft=(10, 10))
-        self.screen.blit(balance_text, balance_rect)
-
-        bet_text = self.mono_font.render(f'Current Bet: ${self.player.bet}', True, WHITE)
-        bet_rect = bet_text.get_rect(topleft=(10, 10 + self.font_size + 5))
-        self.screen.blit(bet_text, bet_rect)
+        self.draw_text(f'Cash Money: ${self.player.balance}', WHITE, topleft=(10, 10))
+        self.draw_text(f'Current Bet: ${self.player.bet}', WHITE, topleft=(10, 10 + self.font_size + 5))
 
     def draw_betting(self):
-        # Draw slider
-        self.bet_slider.draw(self.screen)
+        # Draw slider, keyed on the handle position so only a moved handle is redrawn
+        slider = self.bet_slider
+        self.renderer.draw(('slider', slider.handle_x, tuple(slider.rect)), slider.get_bounds(), slider.draw)
 
         slider_y = self.bet_slider.rect.y
 
         # Display current bet value
-        bet_value_text = self.mono_font.render(f'Bet Amount: ${int(self.bet_slider.value)}', True, WHITE)
-        bet_value_rect = bet_value_text.get_rect(center=(self.SCREEN_WIDTH // 2, slider_y - 30))
-        self.screen.blit(bet_value_text, bet_value_rect)
+        self.draw_text(f'Bet Amount: ${int(self.bet_slider.value)}', WHITE, center=(self.SCREEN_WIDTH // 2, slider_y - 30))
 
         # Display prompt
-        prompt_text = self.mono_font.render('Adjust your bet and press Enter', True, WHITE)
-        prompt_rect = prompt_text.get_rect(center=(self.SCREEN_WIDTH // 2, slider_y - 60))
-        self.screen.blit(prompt_text, prompt_rect)
+        self.draw_text('Adjust your bet and press Enter', WHITE, center=(self.SCREEN_WIDTH // 2, slider_y - 60))
 
         # Display current balance
-        balance_text = self.mono_font.render(f'Cash Money: ${self.player.balance}', True, WHITE)
-        balance_rect = balance_text.get_rect(center=(self.SCREEN_WIDTH // 2, slider_y + 50))
-        self.screen.blit(balance_text, balance_rect)
-
-    def process_outcome(self):
-        if not self.outcome_processed:
-            # Determine the outcome
-            if self.player_busted:
-                self.outcome = "Bust! You lose."
-                # Player already lost the bet amount when placing the bet
-            elif self.dealer_busted:
-                self.outcome = "Dealer busts! You win!"
-                self.player.add_cash(self.player.bet * 2)  # Win amount equal to the bet
-            else:
-                player_total = self.player.get_total()
-                dealer_total = self.dealer.get_total()
-
-                if player_total > dealer_total:
-                    self.outcome = "You win!"
-                    self.player.add_cash(self.player.bet * 2)  # Win amount equal to the bet
-                elif player_total == dealer_total:
-                    self.outcome = "Push! It's a tie."
-                    self.player.add_cash(self.player.bet)  # Return the bet amount
-                else:
-                    self.outcome = "You lose."
-                    # Player already lost the bet amount when placing the bet
-
-            self.outcome_processed = True  # Set the flag to prevent re-processing
+        self.draw_text(f'Cash Money: ${self.player.balance}', WHITE, center=(self.SCREEN_WIDTH // 2, slider_y + 50))
 
     def draw_game_over(self):
         # Centered positions
@@ -422,59 +554,74 @@ class Game:
         balance_y = self.SCREEN_HEIGHT // 2
 
         # Display balance at the vertical center
-        balance_text = self.mono_font.render(f'Cash Money: ${self.player.balance}', True, WHITE)
-        balance_rect = balance_text.get_rect(center=(center_x, balance_y))
-        self.screen.blit(balance_text, balance_rect)
+        self.draw_text(f'Cash Money: ${self.player.balance}', WHITE, center=(center_x, balance_y))
 
         # Display outcome above the balance
-        outcome_text = self.mono_font.render(self.outcome, True, WHITE)
         outcome_y = balance_y - self.font_size * 1.5  # Adjust spacing as needed
-        outcome_rect = outcome_text.get_rect(center=(center_x, outcome_y))
-        self.screen.blit(outcome_text, outcome_rect)
+        self.draw_text(self.outcome, WHITE, center=(center_x, outcome_y))
 
         # Display "Click anywhere to play again." below the balance
         if self.player.balance == 0:
-            play_again_text = self.mono_font.render("Click to continue", True, WHITE)
+            play_again = "Click to continue"
         else:
-            play_again_text = self.mono_font.render('Click anywhere to play again.', True, WHITE)
+            play_again = 'Click anywhere to play again.'
         play_again_y = balance_y + self.font_size * 1.5  # Adjust spacing as needed
-        play_again_rect = play_again_text.get_rect(center=(center_x, play_again_y))
-        self.screen.blit(play_again_text, play_again_rect)
+        self.draw_text(play_again, WHITE, center=(center_x, play_again_y))
 
     def draw_game_ended(self):
-        # Clear the screen and display the background
-        self.screen.blit(self.background_image, (0, 0))
-
-        # Centered positions for displaying text
+        # Centered positions for displaying text (the renderer clears to the background)
         center_x = self.SCREEN_WIDTH // 2
         center_y = self.SCREEN_HEIGHT // 2
 
         # Display game over message
-        game_over_text = self.mono_font.render("Game Over!", True, WHITE)
-        game_over_rect = game_over_text.get_rect(center=(center_x, center_y - self.font_size * 2))
-        self.screen.blit(game_over_text, game_over_rect)
+        self.draw_text("Game Over!", WHITE, center=(center_x, center_y - self.font_size * 2))
 
         # Display message that the player is out of cash
-        out_of_cash_text = self.mono_font.render("You have run out of cash money.", True, WHITE)
-        out_of_cash_rect = out_of_cash_text.get_rect(center=(center_x, center_y))
-        self.screen.blit(out_of_cash_text, out_of_cash_rect)
+        self.draw_text("You have run out of cash money.", WHITE, center=(center_x, center_y))
 
         # Display message prompting the player to exit or restart
-        exit_text = self.mono_font.render("Press 'R' to restart or click to exit.", True, WHITE)
-        exit_rect = exit_text.get_rect(center=(center_x, center_y + self.font_size * 2))
-        self.screen.blit(exit_text, exit_rect)
+        self.draw_text("Press 'R' to restart or click to exit.", WHITE, center=(center_x, center_y + self.font_size * 2))
 
-        pygame.display.flip()  # Update the display
+    def is_idle(self):
+        # Nothing changes on screen until the next event (input, resize or DEALER_HIT_EVENT)
+        return self.game_state not in ("DEALING", "DEALER_TURN") and self.pending_size is None
 
     def run(self):
+        clock = pygame.time.Clock()
         while self.running:
-            for event in pygame.event.get():
-                self.handle_events(event)
+            if self.autoplay is not None:
+                # Turbo: rounds back to back, only drawn every draw_every rounds and never frame-capped
+                self.update_resize()
+                if self.autoplay.run_slice(self) and self.pending_size is None:
+                    self.draw()
+                events = pygame.event.get()
+            else:
+                # Game logic outside event loop
+                self.game_logic()
+
+                # Draw everything, unless the window is still being resized
+                self.update_resize()
+                if self.pending_size is None:
+                    self.draw()
 
-            # Game logic outside event loop
-            self.game_logic()
+                if self.is_idle():
+                    # Static screen: sleep until an event arrives, the dealer timer wakes us for each hit
+                    events = [pygame.event.wait()] + pygame.event.get()
+                else:
+                    clock.tick(FRAME_RATE)  # Cap the frame rate while the round is moving on its own
+                    events = pygame.event.get()
+
+            for event in events:
+                self.handle_events(event)
 
-            # Draw everything
-            self.draw()
+            if self.profiler.enabled:
+                self.profiler.end_frame()
 
+        if self.autoplay is not None:
+            self.stop_autoplay()  # Puts the hand history back so it gets closed
+        self.shoe_preparer.shutdown()
+        if self.solver_executor is not None:
+            self.solver_executor.shutdown(wait=False, cancel_futures=True)
+        if self.engine.recorder is not None:
+            self.engine.recorder.close()
         pygame.quit()
@@ -0,0 +1,47 @@
+# hand.py
+
+from .constants import values
+
+# Value of each card by value index with aces counted as 1, one ace may count 11 on top
+HARD_VALUES = [10 if value in ['jack', 'queen', 'king'] else 1 if value == 'ace' else int(value) for value in values]
+ACE_INDEX = values.index('ace')
+
+class Hand:
+    """ Cards held by the player or dealer, totals are updated as each card is added """
+
+    __slots__ = ('cards', 'codes', 'hard_total', 'aces', 'total', 'is_soft', 'is_blackjack', 'is_bust')
+
+    def __init__(self):
+        self.cards = []  # Card objects, for drawing (empty when filled through add_code)
+        self.codes = []  # Card codes of every card in the hand
+        self.hard_total = 0  # Total with every ace counted as 1
+        self.aces = 0
+        self.total = 0
+        self.is_soft = False
+        self.is_blackjack = False
+        self.is_bust = False
+
+    def add_card(self, card):
+        self.cards.append(card)
+        self.add_code(card.code)
+
+    def add_code(self, code):
+        # O(1) update of the totals, same result as counting aces as 11 and dropping 10 while over 21
+        value_index = code % len(values)
+        self.codes.append(code)
+        self.hard_total += HARD_VALUES[value_index]
+        if value_index == ACE_INDEX:
+            self.aces += 1
+        self.is_soft = self.aces > 0 and self.hard_total + 10 <= 21
+        self.total = self.hard_total + 10 if self.is_soft else self.hard_total
+        self.is_blackjack = self.total == 21 and len(self.codes) == 2
+        self.is_bust = self.total > 21
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        return iter(self.cards)
+
+    def __getitem__(self, index):
+        return self.cards[index]
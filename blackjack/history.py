@@ -0,0 +1,209 @@
+# history.py
+#
+# Append-only hand history: a small header followed by one fixed-width record per finished round,
+# so hand N is always at HEADER.size + N * RECORD.size. Game records every round to HISTORY_PATH;
+# read a history back with
+#     python -m blackjack.history Data/hand_history.bin [first hand] [count]
+
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+
+HISTORY_MAGIC = b'BJHH'
+HISTORY_VERSION = 1
+HISTORY_PATH = os.path.join('Data', 'hand_history.bin')
+HEADER = struct.Struct('<4sHH')  # magic, version, record size
+
+# A hand can't hold more than 22 cards: at most 21 before the card that ends it, each worth at least 1
+MAX_CARDS = 22
+NO_CARD = 0xFF
+# hand number, unix time (ms), bet, balance after settling, outcome, shoe number,
+# player card count, dealer card count, player codes, dealer codes, padding to 80 bytes
+RECORD = struct.Struct(f'<QqIqBIBB{MAX_CARDS}s{MAX_CARDS}sx')
+
+# RoundEngine.outcome strings, stored as their index
+OUTCOMES = ("Bust! You lose.", "Dealer busts! You win!", "You win!", "Push! It's a tie.", "You lose.")
+
+HandRecord = namedtuple('HandRecord', 'hand time_ms bet balance outcome shoe player dealer')
+
+def record_actions(record):
+    # Player decisions of a recorded hand: one hit per card after the first two, then a stand unless bust
+    hits = ("hit",) * (len(record.player) - 2)
+    return hits if record.outcome == OUTCOMES[0] else hits + ("stand",)
+
+def net_win(record):
+    # Net change of the balance for the hand, settled as in RoundEngine.process_outcome
+    if record.outcome in (OUTCOMES[1], OUTCOMES[2]):
+        return record.bet
+    if record.outcome == OUTCOMES[3]:
+        return 0
+    return -record.bet
+
+class HandHistoryWriter:
+    """ Buffers records in memory and appends them to the file a block at a time """
+
+    def __init__(self, path, block_size=64 * 1024, sync=False, background=False):
+        self.path = path
+        self.block_size = block_size  # Bytes per write, the most a background write batches together
+        self.sync = sync  # fsync each write so a crash or power loss keeps every written hand
+        self.buffer = bytearray()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.file = open(path, 'a+b', buffering=0)
+        size = self.file.seek(0, os.SEEK_END)
+        if size == 0:
+            self.file.write(HEADER.pack(HISTORY_MAGIC, HISTORY_VERSION, RECORD.size))
+            self.hands = 0
+        else:
+            self.file.seek(0)
+            magic, version, record_size = HEADER.unpack(self.file.read(HEADER.size))
+            if magic != HISTORY_MAGIC or version != HISTORY_VERSION or record_size != RECORD.size:
+                self.file.close()
+                raise ValueError(f"{path} is not a version {HISTORY_VERSION} hand history")
+            self.hands = (size - HEADER.size) // RECORD.size
+            # Drop a record cut short by a crash so every record stays at its fixed offset
+            self.file.truncate(HEADER.size + self.hands * RECORD.size)
+
+        # Background: record() only queues, a writer thread writes (and syncs) each hand as soon as it
+        # arrives, batching whatever queued up meanwhile, so the caller never waits on the disk
+        self.queue = None
+        self.thread = None
+        if background:
+            self.queue = queue.SimpleQueue()
+            self.thread = threading.Thread(target=self.write_queued, name='hand-history', daemon=True)
+            self.thread.start()
+
+    def record(self, engine):
+        # Append the round the engine just settled
+        player = engine.player.hand.codes
+        dealer = engine.dealer.hand.codes
+        record = RECORD.pack(
+            self.hands, int(time.time() * 1000), engine.player.bet, engine.player.balance,
+            OUTCOMES.index(engine.outcome), engine.deck.shuffle_count, len(player), len(dealer),
+            bytes(player).ljust(MAX_CARDS, bytes([NO_CARD])), bytes(dealer).ljust(MAX_CARDS, bytes([NO_CARD])),
+        )
+        self.hands += 1
+        if self.queue is not None:
+            self.queue.put(record)
+            return
+        self.buffer += record
+        if len(self.buffer) >= self.block_size:
+            self.flush()
+
+    def write(self, block):
+        self.file.write(block)
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def write_queued(self):
+        # Writer thread: one write per batch of queued records, None (from close) stops it
+        block = bytearray()
+        while True:
+            record = self.queue.get()
+            while record is not None:
+                block += record
+                if len(block) >= self.block_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if block:
+                self.write(block)
+                block.clear()
+            if record is None:
+                return
+
+    def flush(self):
+        # Background records are written by the writer thread as they come
+        if self.buffer:
+            self.write(self.buffer)
+            self.buffer.clear()
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+        self.flush()
+        self.file.close()
+
+class HandHistory:
+    """ Memory-mapped reader, records are decoded one at a time so any file size streams in constant memory """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size = HEADER.unpack_from(self.data, 0)
+        if magic != HISTORY_MAGIC or version != HISTORY_VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a version {HISTORY_VERSION} hand history")
+        self.hands = (len(self.data) - HEADER.size) // RECORD.size  # Ignores a trailing partial record
+
+    def __len__(self):
+        return self.hands
+
+    def __getitem__(self, hand):
+        # Seek straight to hand N
+        if hand < 0:
+            hand += self.hands
+        if not 0 <= hand < self.hands:
+            raise IndexError(hand)
+        return self.decode(HEADER.size + hand * RECORD.size)
+
+    def decode(self, offset):
+        (number, time_ms, bet, balance, outcome, shoe, player_count, dealer_count,
+         player, dealer) = RECORD.unpack_from(self.data, offset)
+        return HandRecord(number, time_ms, bet, balance, OUTCOMES[outcome], shoe,
+                          player[:player_count], dealer[:dealer_count])
+
+    def __iter__(self):
+        return self.replay()
+
+    def replay(self, start=0, stop=None):
+        # Records from hand start up to (not including) stop, in order
+        stop = self.hands if stop is None else min(stop, self.hands)
+        for hand in range(start, stop):
+            yield self.decode(HEADER.size + hand * RECORD.size)
+
+    def summary(self, start=0, stop=None):
+        # Totals over a range of hands without keeping any records around
+        hands = wins = pushes = losses = net = 0
+        for record in self.replay(start, stop):
+            hands += 1
+            won = net_win(record)
+            net += won
+            if won > 0:
+                wins += 1
+            elif won < 0:
+                losses += 1
+            else:
+                pushes += 1
+        return {'hands': hands, 'wins': wins, 'pushes': pushes, 'losses': losses, 'net': net}
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+if __name__ == '__main__':
+    import json
+    import sys
+    from .card import CARD_NAMES
+    with HandHistory(sys.argv[1] if len(sys.argv) > 1 else HISTORY_PATH) as history:
+        start = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+        count = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+        for record in history.replay(start, start + count):
+            print(record.hand, record.bet, record.balance, record.outcome,
+                  [CARD_NAMES[code] for code in record.player], [CARD_NAMES[code] for code in record.dealer],
+                  '/'.join(record_actions(record)))
+        print(json.dumps(history.summary()))
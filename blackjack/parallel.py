@@ -0,0 +1,70 @@
+# parallel.py
+#
+# Plays rounds of the real RoundEngine logic across a process pool. The rounds are cut into fixed-size
+# chunks, each with its own shoe and a random.Random stream derived from (master seed, chunk index),
+# so a given seed gives the same result whatever the number of workers.
+
+import hashlib
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from .constants import DECKS_IN_SHOE
+from .engine import RoundEngine
+from .policies import HitBelow
+from .simulator import SimulationResult
+from .stats import SessionStats
+
+# Small enough that a default 200k-round run spreads over 100 processes. Part of the result's
+# identity: changing it changes which rounds each stream plays.
+CHUNK_ROUNDS = 2_000
+
+def chunk_seed(seed, chunk):
+    # Independent 64-bit seed per chunk, stable across processes and Python versions
+    digest = hashlib.sha256(f"{seed}:{chunk}".encode()).digest()
+    return int.from_bytes(digest[:8], 'little')
+
+def play_chunk(seed, chunk, rounds, policy, num_decks, penetration):
+    # Worker: play rounds on a fresh engine, returns the chunk's SessionStats
+    engine = RoundEngine(num_decks=num_decks, penetration=penetration, rng=random.Random(chunk_seed(seed, chunk)))
+    engine.stats = SessionStats(engine.player.balance)
+    for _ in range(rounds):
+        if engine.player.balance < policy(None, None, engine.player.balance)[1]:
+            engine.restart()  # Bankroll isn't what's being measured, keep playing at the policy's bet
+        engine.play_round(policy)
+    return engine.stats
+
+def simulate_rounds(rounds, policy=None, seed=0, workers=None, num_decks=DECKS_IN_SHOE,
+                    penetration=None, chunk_rounds=CHUNK_ROUNDS):
+    # Play rounds through RoundEngine on up to workers processes (default: every core)
+    policy = policy or HitBelow(17)
+    chunks = [min(chunk_rounds, rounds - start) for start in range(0, rounds, chunk_rounds)]
+    workers = workers or os.cpu_count() or 1
+    arguments = [(seed, chunk, size, policy, num_decks, penetration) for chunk, size in enumerate(chunks)]
+
+    if workers == 1 or len(chunks) <= 1:
+        totals = [play_chunk(*args) for args in arguments]
+    else:
+        with ProcessPoolExecutor(min(workers, len(chunks))) as executor:
+            totals = list(executor.map(play_chunk, *zip(*arguments)))
+
+    # Integer counters merge exactly, in chunk order
+    stats = SessionStats()
+    for chunk in totals:
+        stats.merge(chunk)
+    outcomes = stats.outcome_counts()
+    wins = outcomes['dealer_bust'] + outcomes['win']
+    losses = outcomes['bust'] + outcomes['loss']
+    bet = stats.bet_sum / rounds if rounds else 0  # Mean bet, the policy may vary it
+    return SimulationResult(rounds, wins, outcomes['push'], losses, wins - losses, wins + losses, bet, stats)
+
+if __name__ == '__main__':
+    import json
+    import sys
+    import time
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    start = time.perf_counter()
+    result = simulate_rounds(rounds)
+    summary = result.summary()
+    summary['session'] = result.stats.summary()
+    summary['seconds'] = time.perf_counter() - start
+    print(json.dumps(summary, indent=2))
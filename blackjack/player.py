@@ -1,12 +1,11 @@
 # player.py
 
-from typing import List
-from .card import Card
+from .hand import Hand
 
 class Player:
     def __init__(self, name, starting_balance):
         self.name = name
-        self.hand: List[Card] = []
+        self.hand = Hand()
         self.balance = starting_balance
         self.bet = 0  # The current bet placed by the player
     
@@ -25,22 +24,12 @@ class Player:
             return False  # Not enough balance to place the bet
     
     def add_card(self, card):
-        self.hand.append(card)
+        self.hand.add_card(card)
     
     def reset_hand(self):
-        self.hand = []
+        self.hand = Hand()
         self.bet = 0  # Reset bet when the hand is reset
     
     def get_total(self):
-        total = 0
-        ace_count = 0
-        for card in self.hand:
-            card_value = card.get_value()
-            total += card_value
-            if card.value == 'ace':
-                ace_count += 1
-        # Adjust for aces if total is over 21
-        while total > 21 and ace_count > 0:
-            total -= 10  # Change an Ace from 11 to 1
-            ace_count -= 1
-        return total
+        # Kept up to date by Hand.add_card, no need to walk the cards
+        return self.hand.total
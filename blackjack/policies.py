@@ -0,0 +1,33 @@
+# policies.py
+#
+# Player policies: policy(hand, upcard, bankroll) -> (action, bet). They are called once before the
+# deal with hand and upcard None (only the bet is used), then at each decision with the player's Hand
+# and the dealer's upcard Card (only the action, "hit" or "stand", is used). RoundEngine.play_round,
+# auto-play, the parallel simulator and the tournament all take them; they are plain classes so they
+# can be sent to worker processes.
+
+class HitBelow:
+    """ Flat bet, hit while the total is below threshold """
+
+    def __init__(self, threshold=17, bet=100):
+        self.threshold = threshold
+        self.bet = bet
+
+    def __call__(self, hand, upcard, bankroll):
+        if hand is None:
+            return None, self.bet
+        return ("hit" if hand.total < self.threshold else "stand"), self.bet
+
+class StrategyPolicy:
+    """ Basic strategy table, betting a flat amount or a fraction of the bankroll """
+
+    def __init__(self, strategy, bet=100, bankroll_fraction=None):
+        self.strategy = strategy
+        self.bet = bet
+        self.bankroll_fraction = bankroll_fraction
+
+    def __call__(self, hand, upcard, bankroll):
+        bet = self.bet if self.bankroll_fraction is None else max(1, int(bankroll * self.bankroll_fraction))
+        if hand is None:
+            return None, bet
+        return self.strategy.recommend_hand(hand, upcard), bet
@@ -0,0 +1,180 @@
+# profiler.py
+#
+# Opt-in frame profiler for Game: set BLACKJACK_PROFILE=1 or press F3 in game, F10 dumps the
+# recorded frames to a JSON file. While off nothing is wrapped, Game only checks one flag per frame.
+
+import json
+import os
+import time
+from collections import deque
+import pygame
+from .surface_cache import card_surfaces
+
+PROFILE_ENV = 'BLACKJACK_PROFILE'
+TOGGLE_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F10
+HUD_REFRESH = 0.25  # Seconds between HUD text updates
+HUD_FONT_SIZE = 16
+
+# Game methods timed each frame, 'draw' includes the draw_* methods it calls
+TIMED_METHODS = ('handle_events', 'game_logic', 'draw', 'draw_hands', 'draw_buttons',
+                 'draw_balance_and_bet', 'draw_betting', 'draw_game_over', 'draw_game_ended')
+COUNTERS = ('blits', 'font_renders', 'scales', 'dirty_rects')
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+class FrameProfiler:
+    """ Times Game methods and counts drawing work per frame over a rolling window """
+
+    def __init__(self, game, window=600):
+        self.game = game
+        self.frames = deque(maxlen=window)  # One dict of seconds and counts per frame
+        self.enabled = False
+        self.current = None
+        self.frame_start = None
+        self.originals = []  # (object, attribute name, original) to put back on disable
+        self.hud_font = None
+        self.hud_lines = []
+        self.hud_updated = 0.0
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def enable(self):
+        if self.enabled:
+            return
+        game = self.game
+        for name in TIMED_METHODS:
+            self.wrap(game, name, self.timed(name, getattr(game, name)))
+        self.wrap(game.renderer, 'blit', self.counted('blits', game.renderer.blit))
+        self.wrap(game.renderer, 'draw', self.counted('blits', game.renderer.draw))
+        self.wrap(game.renderer, 'end_frame', self.dirty_counter(game.renderer.end_frame))
+        self.wrap(game.text_cache, 'render', self.font_counter(game.text_cache))
+        self.wrap(pygame.transform, 'scale', self.counted('scales', pygame.transform.scale))
+        self.wrap(pygame.transform, 'smoothscale', self.counted('scales', pygame.transform.smoothscale))
+        self.hud_font = pygame.font.Font(None, HUD_FONT_SIZE)
+        self.enabled = True
+        self.start_frame()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for target, name, original in reversed(self.originals):
+            if target is pygame.transform:
+                setattr(target, name, original)
+            else:
+                delattr(target, name)  # Back to the class method
+        self.originals = []
+        self.enabled = False
+        self.current = None
+
+    def wrap(self, target, name, wrapper):
+        self.originals.append((target, name, getattr(target, name)))
+        setattr(target, name, wrapper)
+
+    def timed(self, name, method):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                if self.current is not None:
+                    self.current[name] = self.current.get(name, 0.0) + time.perf_counter() - start
+        return wrapper
+
+    def counted(self, counter, function):
+        def wrapper(*args, **kwargs):
+            if self.current is not None:
+                self.current[counter] += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    def dirty_counter(self, end_frame):
+        def wrapper():
+            dirty = end_frame()
+            if self.current is not None:
+                self.current['dirty_rects'] += len(dirty)
+            return dirty
+        return wrapper
+
+    def font_counter(self, text_cache):
+        # Only cache misses rasterize text
+        render = text_cache.render
+        def wrapper(name, size, text, color):
+            if self.current is not None and (name, size, text, color) not in text_cache.surfaces:
+                self.current['font_renders'] += 1
+            return render(name, size, text, color)
+        return wrapper
+
+    def start_frame(self):
+        self.current = dict.fromkeys(COUNTERS, 0)
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        # Called by Game.run once per loop iteration, after events are handled
+        now = time.perf_counter()
+        frame = self.current
+        frame['time'] = now
+        frame['frame'] = sum(frame.get(name, 0.0) for name in ('handle_events', 'game_logic', 'draw'))
+        self.frames.append(frame)
+        self.start_frame()
+
+    def stats(self):
+        frames = list(self.frames)
+        if not frames:
+            return {'frames': 0}
+        elapsed = frames[-1]['time'] - frames[0]['time']
+        frame_times = [frame['frame'] for frame in frames]
+        totals = {}
+        for frame in frames:
+            for name in TIMED_METHODS:
+                if name != 'draw' and name in frame:
+                    totals[name] = totals.get(name, 0.0) + frame[name]
+        return {
+            'frames': len(frames),
+            'fps': (len(frames) - 1) / elapsed if elapsed > 0 else 0.0,
+            'frame_p50_ms': percentile(frame_times, 0.5) * 1000,
+            'frame_p99_ms': percentile(frame_times, 0.99) * 1000,
+            'top': sorted(((name, total / len(frames) * 1000) for name, total in totals.items()),
+                          key=lambda item: item[1], reverse=True)[:3],  # Mean ms per frame
+            **{counter: frames[-1][counter] for counter in COUNTERS},  # Last complete frame
+        }
+
+    def dump(self, path=None):
+        # Write the rolling window to a JSON file, returns its path
+        path = path or f"profile_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, 'w') as profile_file:
+            json.dump({'stats': self.stats(), 'frames': list(self.frames)}, profile_file, indent=1)
+        return path
+
+    def draw_hud(self, renderer):
+        # Small overlay in the top-left corner, its text only changes a few times per second
+        now = time.perf_counter()
+        if now - self.hud_updated >= HUD_REFRESH:
+            stats = self.stats()
+            if stats['frames']:
+                self.hud_lines = [
+                    f"FPS {stats['fps']:.1f}  p50 {stats['frame_p50_ms']:.2f}ms  p99 {stats['frame_p99_ms']:.2f}ms",
+                    f"blits {stats['blits']}  fonts {stats['font_renders']}  scales {stats['scales']}  dirty {stats['dirty_rects']}",
+                    f"textures {card_surfaces.resident_bytes()['total'] / 2**20:.1f}MB",
+                ] + [f"{name} {ms:.2f}ms" for name, ms in stats['top']]
+            self.hud_updated = now
+
+        lines = tuple(self.hud_lines)
+        line_height = self.hud_font.get_linesize()
+        width = max((self.hud_font.size(line)[0] for line in lines), default=0) + 12
+        rect = pygame.Rect(8, 8, width, line_height * len(lines) + 8)
+
+        def draw(surface):
+            surface.fill((0, 0, 0), rect)
+            for i, line in enumerate(lines):
+                surface.blit(self.hud_font.render(line, True, (255, 255, 255)), (rect.x + 6, rect.y + 4 + i * line_height))
+        renderer.draw(('hud', lines), rect, draw)
+
+def profiler_requested():
+    return os.environ.get(PROFILE_ENV, '') not in ('', '0')
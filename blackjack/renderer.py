@@ -0,0 +1,72 @@
+# renderer.py
+
+import pygame
+
+class DirtyRenderer:
+    """ Retained-mode drawing: records each frame's draw calls and repaints only what changed """
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.items = []  # (key, rect, surface, draw function) recorded this frame
+        self.previous = {}  # (key, rect) -> rect from the last presented frame
+        self.full_redraw = True
+
+    def reset(self, screen, background):
+        # New display surface or background (e.g. after a resize), repaint everything
+        self.screen = screen
+        self.background = background
+        self.invalidate()
+
+    def set_background(self, background):
+        # Switch what's painted under the items, e.g. between table layers
+        if background is not self.background:
+            self.background = background
+            self.invalidate()
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def begin_frame(self):
+        self.items = []
+
+    def blit(self, surface, dest, key=None):
+        # Same signature as Surface.blit so Card.draw_card can draw straight into the renderer.
+        # Without a key the surface identity is used, which is fine for long-lived cached surfaces.
+        rect = pygame.Rect(dest[0], dest[1], *surface.get_size())
+        if key is None:
+            key = id(surface)
+        self.items.append((key, tuple(rect), surface, None))
+
+    def draw(self, key, rect, draw_function):
+        # Shapes (buttons, slider) drawn by draw_function(surface), key must describe their look
+        self.items.append((key, tuple(pygame.Rect(rect)), None, draw_function))
+
+    def end_frame(self):
+        # Work out what changed since the last frame and push only those regions to the display
+        current = {(key, rect): rect for key, rect, _, _ in self.items}
+        if self.full_redraw:
+            dirty = [self.screen.get_rect()]
+            self.full_redraw = False
+        else:
+            changed = current.keys() ^ self.previous.keys()
+            dirty = [pygame.Rect(current.get(item) or self.previous[item]) for item in changed]
+        self.previous = current
+
+        if dirty:
+            for rect in dirty:
+                self.repaint(rect)
+            pygame.display.update(dirty)
+        return dirty
+
+    def repaint(self, rect):
+        # Redraw the background and every item overlapping rect, clipped to rect
+        self.screen.set_clip(rect)
+        self.screen.blit(self.background, rect, rect)
+        for _, item_rect, surface, draw_function in self.items:
+            if rect.colliderect(item_rect):
+                if surface is not None:
+                    self.screen.blit(surface, item_rect)
+                else:
+                    draw_function(self.screen)
+        self.screen.set_clip(None)
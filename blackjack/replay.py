@@ -0,0 +1,131 @@
+# replay.py
+#
+# Renders rounds from a hand history (see history.py) offscreen with Game's own drawing code, as PNG
+# files or one raw RGB stream, across worker processes:
+#     python -m blackjack.replay Data/hand_history.bin replay.rgb --start 0 --stop 1000
+#     ffmpeg -f rawvideo -pix_fmt rgb24 -s 1280x720 -r 2 -i replay.rgb replay.mp4
+# Run from the directory that holds Images/.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from .history import HandHistory, OUTCOMES
+
+REPLAY_SIZE = (1280, 720)
+
+def round_frames(record):
+    # (state, player codes, dealer codes, hole card shown) for each frame of a recorded round,
+    # following RoundEngine: the deal, each hit, then the dealer's reveal and draws unless the player bust
+    player, dealer = list(record.player), list(record.dealer)
+    frames = [("PLAYER_TURN", player[:count], dealer[:2], False) for count in range(2, len(player) + 1)]
+    if record.outcome == OUTCOMES[0]:
+        frames[-1] = ("GAME_OVER", player, dealer[:2], False)  # Bust ends the round before the reveal
+        return frames
+    frames += [("DEALER_HITTING", player, dealer[:count], True) for count in range(2, len(dealer) + 1)]
+    frames.append(("GAME_OVER", player, dealer, True))
+    return frames
+
+def frame_count(history, start, stop):
+    return sum(len(round_frames(record)) for record in history.replay(start, stop))
+
+class ReplayRenderer:
+    """ Offscreen Game whose state is set frame by frame from recorded rounds """
+
+    def __init__(self, size=REPLAY_SIZE):
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        import pygame
+        from .game import Game
+        pygame.init()
+        # Replays never open the hand history, and the card surfaces are scaled once up front (no
+        # worker thread), every frame reuses them
+        self.game = Game(pygame.display.set_mode(size), record_history=False, threaded_prep=False)
+        self.game.show_hints = False
+
+    def set_frame(self, record, frame):
+        # Put the engine in the state of one frame, Game.draw does the rest
+        from .card import Card
+        from .history import net_win
+        state, player_codes, dealer_codes, hole_shown = frame
+        engine = self.game.engine
+        engine.player.reset_hand()
+        engine.dealer.reset_hand()
+        for code in player_codes:
+            engine.player.add_card(Card.from_code(code))
+        for code in dealer_codes:
+            engine.dealer.add_card(Card.from_code(code))
+        engine.dealer.hand[1].face_up = hole_shown
+        engine.player.bet = record.bet
+        if state == "GAME_OVER":
+            engine.player.balance = record.balance
+            engine.outcome = record.outcome
+        else:
+            engine.player.balance = record.balance - net_win(record) - record.bet  # Bet already taken
+        engine.state = state
+
+    def frames(self, record):
+        # Yields the display surface once per frame of the round (the same surface, redrawn)
+        for frame in round_frames(record):
+            self.set_frame(record, frame)
+            self.game.draw()
+            yield self.game.screen
+
+def render_chunk(history_path, start, stop, output, size=REPLAY_SIZE, offset=None):
+    # Worker: render hands start..stop. PNGs go to the output directory, raw frames are written into
+    # the output file at offset (bytes), so chunks from different processes land in order.
+    import pygame
+    renderer = ReplayRenderer(size)
+    frame_bytes = size[0] * size[1] * 3
+    written = 0
+    with HandHistory(history_path) as history:
+        stream = open(output, 'r+b') if offset is not None else None
+        try:
+            for record in history.replay(start, stop):
+                for index, surface in enumerate(renderer.frames(record)):
+                    if stream is None:
+                        pygame.image.save(surface, os.path.join(output, f'hand_{record.hand:08d}_{index:02d}.png'))
+                    else:
+                        os.pwrite(stream.fileno(), pygame.image.tobytes(surface, 'RGB'), offset + written * frame_bytes)
+                    written += 1
+        finally:
+            if stream is not None:
+                stream.close()
+    return written
+
+def render_history(history_path, output, start=0, stop=None, size=REPLAY_SIZE, workers=None, chunk_hands=500):
+    # Render a range of hands across processes, to PNGs if output is a directory, else one raw RGB file.
+    # Returns the number of frames.
+    with HandHistory(history_path) as history:
+        stop = len(history) if stop is None else min(stop, len(history))
+        chunks = [(first, min(first + chunk_hands, stop)) for first in range(start, stop, chunk_hands)]
+        counts = [frame_count(history, first, last) for first, last in chunks]
+
+    raw = not os.path.isdir(output)
+    offsets = [None] * len(chunks)
+    if raw:
+        frame_bytes = size[0] * size[1] * 3
+        with open(output, 'wb') as stream:
+            stream.truncate(sum(counts) * frame_bytes)
+        position = 0
+        for index, count in enumerate(counts):
+            offsets[index] = position * frame_bytes
+            position += count
+
+    with ProcessPoolExecutor(workers) as executor:
+        jobs = [executor.submit(render_chunk, history_path, first, last, output, size, offset)
+                for (first, last), offset in zip(chunks, offsets)]
+        return sum(job.result() for job in jobs)
+
+if __name__ == '__main__':
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Render recorded hands to PNG frames or a raw RGB stream")
+    parser.add_argument('history')
+    parser.add_argument('output', help="directory for PNGs, any other path for a raw rgb24 stream")
+    parser.add_argument('--start', type=int, default=0)
+    parser.add_argument('--stop', type=int)
+    parser.add_argument('--size', type=int, nargs=2, default=REPLAY_SIZE)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    frames = render_history(args.history, args.output, args.start, args.stop, tuple(args.size), args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"Rendered {frames} frames in {elapsed:.1f}s ({frames / elapsed:.0f} frames/s)")
@@ -0,0 +1,225 @@
+# server.py
+#
+# Many headless tables on one asyncio event loop. Each connection gets its own table
+# (deck, player, dealer and RoundEngine state machine) and talks line-delimited JSON:
+#     {"action": "bet", "amount": 100}   {"action": "hit"}   {"action": "stand"}
+#     {"action": "state"}   {"action": "restart"}   {"action": "metrics"}
+# Run with
+#     python -m blackjack.server --port 8765 --dealer-delay 1.0
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from .engine import RoundEngine
+
+# Backpressure limits per connection
+MAX_LINE_BYTES = 4096
+MAX_QUEUED_MESSAGES = 64
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class Table:
+    """ One headless table: a RoundEngine plus the connection it reports to """
+
+    def __init__(self, table_id, send, dealer_delay):
+        self.table_id = table_id
+        self.engine = RoundEngine()
+        self.send = send  # Queues a message for the client without blocking
+        self.dealer_delay = dealer_delay
+        self.dealer_timer = None
+        self.actions = 0
+        self.latencies = deque(maxlen=1024)  # Seconds from request received to reply queued
+
+    def state(self):
+        engine = self.engine
+        dealer_visible = all(card.face_up for card in engine.dealer.hand)
+        return {
+            'table': self.table_id,
+            'state': engine.state,
+            'balance': engine.player.balance,
+            'bet': engine.player.bet,
+            'player': list(engine.player.hand.codes),  # Copied, the reply may be queued while the hand grows
+            'player_total': engine.player.hand.total,
+            'dealer': [card.code if card.face_up else None for card in engine.dealer.hand],
+            'dealer_total': engine.dealer.hand.total if dealer_visible else None,
+            'outcome': engine.outcome if engine.state == "GAME_OVER" else None,
+        }
+
+    def handle(self, request):
+        # Apply one client request, returns the reply dict
+        engine = self.engine
+        action = request.get('action')
+        ok = True
+        if action == 'bet':
+            amount = request.get('amount')
+            if not isinstance(amount, int) or isinstance(amount, bool):
+                return {'reply': action, 'ok': False, 'error': 'amount must be an integer'}
+            if engine.state == "GAME_OVER":
+                self.cancel_dealer()
+                engine.next_round()
+            ok = engine.place_bet(amount)
+            if ok:
+                engine.advance()  # Deal, stops at PLAYER_TURN
+        elif action == 'hit':
+            ok = engine.hit()
+        elif action == 'stand':
+            ok = engine.stand()
+            if ok:
+                self.start_dealer()
+        elif action == 'restart':
+            ok = engine.state == "GAME_ENDED"
+            if ok:
+                self.cancel_dealer()
+                engine.restart()
+        elif action != 'state':
+            return {'reply': action, 'ok': False, 'error': 'unknown action'}
+        self.actions += 1
+        return {'reply': action, 'ok': ok, **self.state()}
+
+    def start_dealer(self):
+        # Reveal the hole card, then the dealer hits on a timer instead of DEALER_HIT_EVENT
+        self.engine.step()
+        if self.dealer_delay <= 0:
+            self.engine.advance()
+        else:
+            self.dealer_timer = asyncio.get_running_loop().call_later(self.dealer_delay, self.dealer_hit)
+
+    def dealer_hit(self):
+        self.engine.step()
+        if self.engine.state == "DEALER_HITTING":
+            self.dealer_timer = asyncio.get_running_loop().call_later(self.dealer_delay, self.dealer_hit)
+        else:
+            self.dealer_timer = None
+        self.send({'event': 'dealer', **self.state()})
+
+    def cancel_dealer(self):
+        # Stop a dealer timer so it can't fire into the next round
+        if self.dealer_timer is not None:
+            self.dealer_timer.cancel()
+            self.dealer_timer = None
+
+    def close(self):
+        self.cancel_dealer()
+
+class TableServer:
+    """ asyncio server hosting one Table per connection """
+
+    def __init__(self, dealer_delay=1.0, max_tables=10_000):
+        self.dealer_delay = dealer_delay
+        self.max_tables = max_tables
+        self.tables = {}
+        self.next_table_id = 0
+        self.started = time.perf_counter()
+        self.total_actions = 0
+        self.latencies = deque(maxlen=10_000)
+
+    def metrics(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'tables': len(self.tables),
+            'actions': self.total_actions,
+            'actions_per_second': self.total_actions / elapsed if elapsed else 0.0,
+            'latency_p50_ms': (percentile(self.latencies, 0.5) or 0.0) * 1000,
+            'latency_p99_ms': (percentile(self.latencies, 0.99) or 0.0) * 1000,
+            'per_table': {
+                table_id: {
+                    'actions': table.actions,
+                    'latency_p50_ms': (percentile(table.latencies, 0.5) or 0.0) * 1000,
+                    'latency_p99_ms': (percentile(table.latencies, 0.99) or 0.0) * 1000,
+                }
+                for table_id, table in self.tables.items()
+            },
+        }
+
+    async def handle_connection(self, reader, writer):
+        outgoing = asyncio.Queue(MAX_QUEUED_MESSAGES)
+        sender = asyncio.create_task(self.write_messages(outgoing, writer))
+
+        def send(message):
+            # Timer pushes can't wait, a client that stops reading loses its table
+            try:
+                outgoing.put_nowait(message)
+            except asyncio.QueueFull:
+                writer.close()
+
+        if len(self.tables) >= self.max_tables:
+            await outgoing.put({'ok': False, 'error': 'server full'})
+            await outgoing.put(None)
+            await sender
+            return
+
+        table = Table(self.next_table_id, send, self.dealer_delay)
+        self.next_table_id += 1
+        self.tables[table.table_id] = table
+        await outgoing.put({'event': 'joined', **table.state()})
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                received = time.perf_counter()
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    reply = {'ok': False, 'error': 'invalid json'}
+                else:
+                    if not isinstance(request, dict):
+                        reply = {'ok': False, 'error': 'request must be a json object'}
+                    elif request.get('action') == 'metrics':
+                        reply = {'reply': 'metrics', 'ok': True, **self.metrics()}
+                    else:
+                        reply = table.handle(request)
+                latency = time.perf_counter() - received
+                table.latencies.append(latency)
+                self.latencies.append(latency)
+                self.total_actions += 1
+                # Waits when the client isn't reading its replies, which stops us reading its requests
+                await outgoing.put(reply)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # Dropped connection, or readline's ValueError for a line over MAX_LINE_BYTES
+        finally:
+            table.close()
+            del self.tables[table.table_id]
+            await outgoing.put(None)
+            await sender
+
+    async def write_messages(self, outgoing, writer):
+        try:
+            while True:
+                message = await outgoing.get()
+                if message is None:
+                    break
+                writer.write(json.dumps(message).encode() + b'\n')
+                await writer.drain()  # Respect the socket's flow control
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_BYTES,
+                                            backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many headless blackjack tables")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--dealer-delay', type=float, default=1.0, help="seconds between dealer hits, 0 for none")
+    parser.add_argument('--max-tables', type=int, default=10_000)
+    args = parser.parse_args()
+    server = TableServer(args.dealer_delay, args.max_tables)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
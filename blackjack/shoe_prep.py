@@ -0,0 +1,40 @@
+# shoe_prep.py
+
+from concurrent.futures import ThreadPoolExecutor
+from .card import CARD_NAMES
+from .surface_cache import card_surfaces
+
+# Every image a shoe can show: the card faces and the back
+SHOE_IMAGES = [f'{value}_of_{suit}' for value, suit in CARD_NAMES] + ['red_back']
+
+class ShoePreparer:
+    """ Shuffles the next shoe and scales its card images on a worker thread while a round is played """
+
+    def __init__(self, threaded=True):
+        # Unthreaded, prepare() does the work before returning (offscreen renderers, no extra thread)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='shoe') if threaded else None
+        self.pending = None
+        self.warmed = None  # Card size whose surfaces were last scaled
+
+    def prepare(self, deck, card_size):
+        # Queue the next shoe for deck and the card surfaces at card_size, returns at once
+        if self.executor is None:
+            self.prepare_now(deck, tuple(card_size))
+            return None
+        self.pending = self.executor.submit(self.prepare_now, deck, tuple(card_size))
+        return self.pending
+
+    def prepare_now(self, deck, card_size):
+        deck.prepare_next()
+        if card_size != self.warmed or card_size not in card_surfaces.sizes:
+            for name in SHOE_IMAGES:
+                card_surfaces.get(name, card_size)  # Loads the image too if it wasn't yet
+            self.warmed = card_size
+
+    def wait(self):
+        if self.pending is not None:
+            self.pending.result()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,202 @@
+# simulator.py
+
+import numpy as np
+from .constants import values
+from .card import DECK_SIZE
+from .history import OUTCOMES
+from .stats import SessionStats, TOTAL_BINS, UPCARDS
+
+# Blackjack value of each rank index, same rules as Card.get_value (aces counted as 11)
+RANK_VALUES = np.array(
+    [10 if value in ['jack', 'queen', 'king'] else 11 if value == 'ace' else int(value) for value in values],
+    dtype=np.int8,
+)
+ACE = values.index('ace')
+
+
+def hit_below(threshold):
+    # Fixed policy: hit while the hand total is below threshold, ignoring the dealer upcard
+    def policy(totals, soft, upcard):
+        return totals < threshold
+    return policy
+
+
+def table_policy(strategy):
+    # Vectorized lookup into a BasicStrategy table (see strategy.py)
+    table = np.frombuffer(bytes(strategy.table), dtype=np.uint8)
+    def policy(totals, soft, upcard):
+        return table[strategy.index(np.minimum(totals, 21), soft.astype(np.int16), upcard)] == 1
+    return policy
+
+
+class SimulationResult:
+    """ Aggregated outcome of a batch simulation, per unit bet """
+
+    def __init__(self, hands, wins, pushes, losses, net_sum, net_sq_sum, bet, stats=None):
+        self.hands = hands
+        self.wins = wins
+        self.pushes = pushes
+        self.losses = losses
+        self.net_sum = net_sum
+        self.net_sq_sum = net_sq_sum
+        self.bet = bet
+        self.stats = stats  # SessionStats of the run at the simulated bet, when it was collected
+
+    @property
+    def ev(self):
+        # Expected net win per hand, as a fraction of the bet
+        return self.net_sum / self.hands
+
+    @property
+    def variance(self):
+        # Per-hand variance of the net win, in units of the bet
+        mean = self.ev
+        return self.net_sq_sum / self.hands - mean * mean
+
+    @property
+    def std_error(self):
+        return (self.variance / self.hands) ** 0.5
+
+    def confidence_interval(self, z=1.96):
+        margin = z * self.std_error
+        return self.ev - margin, self.ev + margin
+
+    def bankroll_variance(self, hands):
+        # Variance of the bankroll after a session of this many hands at the simulated bet
+        return hands * self.variance * self.bet * self.bet
+
+    @property
+    def win_rate(self):
+        return self.wins / self.hands
+
+    @property
+    def push_rate(self):
+        return self.pushes / self.hands
+
+    @property
+    def loss_rate(self):
+        return self.losses / self.hands
+
+    def summary(self):
+        low, high = self.confidence_interval()
+        return {
+            'hands': self.hands,
+            'ev': self.ev,
+            'ev_95_ci': (low, high),
+            'win_rate': self.win_rate,
+            'push_rate': self.push_rate,
+            'loss_rate': self.loss_rate,
+            'variance': self.variance,
+            'expected_profit': self.ev * self.bet * self.hands,
+            'bankroll_variance': self.bankroll_variance(self.hands),
+        }
+
+
+def shuffled_shoes(rng, count):
+    # One independently shuffled 52-card deck per row, as rank indices
+    shoes = np.tile(np.arange(DECK_SIZE, dtype=np.int8) % len(values), (count, 1))
+    return rng.permuted(shoes, axis=1)
+
+
+def hand_totals(hard, aces):
+    # Vector form of Player.get_total: count one ace as 11 while that doesn't bust
+    soft_total = hard - 10 * aces
+    soft = (aces > 0) & (soft_total + 10 <= 21)
+    return np.where(soft, soft_total + 10, soft_total), soft
+
+
+def batch_stats(net, bet, player_totals, dealer_totals, upcard, player_bust, dealer_bust):
+    # SessionStats of a played batch, built from whole-array counts (the hands in row order)
+    stats = SessionStats()
+    amounts = net.astype(np.int64) * bet
+    running = np.cumsum(amounts)
+    peaks = np.maximum(np.maximum.accumulate(running), 0)
+    stats.hands = len(net)
+    stats.net_sum = int(running[-1])
+    stats.net_sq_sum = int(np.dot(amounts, amounts))
+    stats.bet_sum = len(net) * bet
+    stats.peak = int(peaks[-1])
+    stats.trough = min(int(running.min()), 0)
+    stats.max_drawdown = int((peaks - running).max())
+    stats.player_totals = np.bincount(np.minimum(player_totals, TOTAL_BINS - 1), minlength=TOTAL_BINS).tolist()
+    stats.dealer_totals = np.bincount(np.minimum(dealer_totals, TOTAL_BINS - 1), minlength=TOTAL_BINS).tolist()
+    # Outcome index as in OUTCOMES: bust, dealer bust, win, push, loss
+    outcome = np.select([player_bust, dealer_bust, net == 1, net == 0], [0, 1, 2, 3], 4)
+    cells = (upcard.astype(np.int64) - 2) * len(OUTCOMES) + outcome
+    counts = np.bincount(cells, minlength=len(UPCARDS) * len(OUTCOMES))
+    stats.by_upcard = counts.reshape(len(UPCARDS), len(OUTCOMES)).tolist()
+    return stats
+
+
+def play_batch(rng, count, policy, stats=None, bet=1):
+    # Play count hands at once, returns the net result of each hand per unit bet.
+    # Pass a SessionStats to have the batch merged into it at the given bet.
+    shoes = shuffled_shoes(rng, count)
+    rows = np.arange(count)
+
+    # Initial deal: player, player, dealer, dealer (dealer's second card is the hole card)
+    ranks = shoes[:, :4]
+    card_values = RANK_VALUES[ranks]
+    player_hard = card_values[:, 0].astype(np.int16) + card_values[:, 1]
+    player_aces = (ranks[:, 0] == ACE).astype(np.int16) + (ranks[:, 1] == ACE)
+    dealer_hard = card_values[:, 2].astype(np.int16) + card_values[:, 3]
+    dealer_aces = (ranks[:, 2] == ACE).astype(np.int16) + (ranks[:, 3] == ACE)
+    upcard = card_values[:, 2]
+    next_card = np.full(count, 4, dtype=np.int16)
+
+    # Player draws while the policy says hit and the hand isn't bust
+    active = np.ones(count, dtype=bool)
+    while True:
+        totals, soft = hand_totals(player_hard, player_aces)
+        active &= (totals <= 21) & policy(totals, soft, upcard)
+        if not active.any():
+            break
+        drawn = shoes[rows[active], next_card[active]]
+        player_hard[active] += RANK_VALUES[drawn]
+        player_aces[active] += drawn == ACE
+        next_card[active] += 1
+    player_totals, _ = hand_totals(player_hard, player_aces)
+    player_bust = player_totals > 21
+
+    # Dealer draws to 17 only when the player stood
+    while True:
+        dealer_totals, _ = hand_totals(dealer_hard, dealer_aces)
+        active = ~player_bust & (dealer_totals < 17)
+        if not active.any():
+            break
+        drawn = shoes[rows[active], next_card[active]]
+        dealer_hard[active] += RANK_VALUES[drawn]
+        dealer_aces[active] += drawn == ACE
+        next_card[active] += 1
+    dealer_bust = dealer_totals > 21
+
+    # Even-money payouts as in RoundEngine.process_outcome
+    net = np.sign(player_totals - dealer_totals).astype(np.int8)
+    net[dealer_bust] = 1
+    net[player_bust] = -1
+    if stats is not None:
+        stats.merge(batch_stats(net, bet, player_totals, dealer_totals, upcard, player_bust, dealer_bust))
+    return net
+
+
+def simulate(hands, policy=None, bet=100, batch_size=200_000, seed=None, collect_stats=False):
+    # Monte Carlo estimate of the policy's EV over a number of hands, each from a fresh deck.
+    # collect_stats also fills a SessionStats (drawdown, totals, upcards) at the bet, at some extra cost.
+    rng = np.random.default_rng(seed)
+    stats = SessionStats() if collect_stats else None
+    policy = policy or hit_below(17)
+    wins = pushes = losses = 0
+    net_sum = net_sq_sum = 0
+    remaining = hands
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        net = play_batch(rng, count, policy, stats, bet)
+        batch_wins = int(np.count_nonzero(net == 1))
+        batch_losses = int(np.count_nonzero(net == -1))
+        wins += batch_wins
+        losses += batch_losses
+        pushes += count - batch_wins - batch_losses
+        net_sum += batch_wins - batch_losses
+        net_sq_sum += batch_wins + batch_losses  # Net is always -1, 0 or 1
+        remaining -= count
+    return SimulationResult(hands, wins, pushes, losses, net_sum, net_sq_sum, bet, stats)
@@ -22,29 +22,30 @@ class Slider:
 
 
 
-    def draw(self, surface):
-        # Draw the slider track (a filled rectangle with rounded edges for a cleaner look)
-        pygame.draw.rect(surface, (180, 180, 180), self.rect, border_radius=self.rect.height // 2)
-
-        # Draw the vertically oval handle (narrower and taller than the slider)
-        handle_rect = pygame.Rect(
+    def get_handle_rect(self):
+        # The vertically oval handle (narrower and taller than the slider)
+        return pygame.Rect(
             int(self.handle_x - self.handle_width / 2),  # Center the handle horizontally on the slider
             self.rect.y + (self.rect.height - self.handle_height) // 2,  # Center vertically
             self.handle_width,
             self.handle_height
         )
-        pygame.draw.ellipse(surface, (50, 50, 50), handle_rect)  # Oval handle
+
+    def get_bounds(self):
+        # Area covered by the track and the handle, used for dirty-rectangle tracking
+        return self.rect.union(self.get_handle_rect())
+
+    def draw(self, surface):
+        # Draw the slider track (a filled rectangle with rounded edges for a cleaner look)
+        pygame.draw.rect(surface, (180, 180, 180), self.rect, border_radius=self.rect.height // 2)
+
+        # Draw the vertically oval handle (narrower and taller than the slider)
+        pygame.draw.ellipse(surface, (50, 50, 50), self.get_handle_rect())  # Oval handle
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             # Check if the click is inside the handle (which is now a vertical oval)
-            handle_rect = pygame.Rect(
-                int(self.handle_x - self.handle_width / 2),
-                self.rect.y + (self.rect.height - self.handle_height) // 2,
-                self.handle_width,
-                self.handle_height
-            )
-            if handle_rect.collidepoint(event.pos):
+            if self.get_handle_rect().collidepoint(event.pos):
                 self.dragging = True
         elif event.type == pygame.MOUSEBUTTONUP:
             self.dragging = False
@@ -0,0 +1,31 @@
+# splash.py
+
+import pygame
+from .constants import WHITE, BLACK
+from .assets import BETTING_IMAGES
+
+SPLASH_COLOR = (12, 90, 60)  # Table green
+
+def show_splash(screen, futures, ready=BETTING_IMAGES):
+    # Progress frame while images decode in the background, returns once the images in ready are
+    # loaded (the rest keep loading behind the game), or False if the window was closed
+    font = pygame.font.Font(None, 36)
+    width, height = screen.get_size()
+    bar = pygame.Rect(width // 4, height // 2, width // 2, 24)
+    while not all(futures[name].done() for name in ready):
+        if pygame.event.peek(pygame.QUIT):
+            return False
+        pygame.event.pump()
+        done = sum(future.done() for future in futures.values())
+
+        screen.fill(SPLASH_COLOR)
+        text = font.render(f"Loading cards {done}/{len(futures)}", True, WHITE)
+        screen.blit(text, text.get_rect(midbottom=(width // 2, bar.y - 12)))
+        pygame.draw.rect(screen, BLACK, bar)
+        pygame.draw.rect(screen, WHITE, (bar.x, bar.y, bar.width * done // len(futures), bar.height))
+        pygame.display.flip()
+        pygame.time.wait(15)
+
+    for name in ready:
+        futures[name].result()  # Re-raise a failed load here rather than in the middle of a frame
+    return True
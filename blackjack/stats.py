@@ -0,0 +1,210 @@
+# stats.py
+#
+# Constant-memory session statistics: every settled hand updates a fixed set of counters, however
+# many hands are played. Game feeds one from RoundEngine (F6 shows it, F7 exports it to JSON), the
+# simulations return one per run. Shards merge exactly in hand order, so a run split across
+# processes gives the same numbers as one long run. Summarize a hand history with
+#     python -m blackjack.stats Data/hand_history.bin
+
+import json
+import time
+from .history import OUTCOMES
+from .constants import suits
+from .hand import Hand, HARD_VALUES
+
+TOTAL_BINS = 32  # Final totals 0..30, the last bin counts 31 and over
+UPCARDS = range(2, 12)  # Dealer upcard by blackjack value, aces as 11
+UPCARD_NAMES = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'A')
+OUTCOME_SIGNS = (-1, 1, 1, 0, -1)  # Net win per unit bet of each entry in OUTCOMES
+OUTCOME_KEYS = ('bust', 'dealer_bust', 'win', 'push', 'loss')
+OUTCOME_INDEX = {outcome: index for index, outcome in enumerate(OUTCOMES)}
+
+# Blackjack value of each card code with aces as 11, the key of the upcard breakdown
+UPCARD_VALUES = [11 if value == 1 else value for value in HARD_VALUES] * len(suits)
+
+class SessionStats:
+    """ Running totals of net wins, drawdown, final totals and outcomes by dealer upcard """
+
+    def __init__(self, start_balance=None):
+        self.start_balance = start_balance  # Balance before the first hand, taken from it if not given
+        self.hands = 0
+        # Net wins are whole amounts, so exact integer power sums give the mean and variance with no
+        # rounding or cancellation, and shards merge by adding them
+        self.net_sum = 0
+        self.net_sq_sum = 0
+        self.bet_sum = 0
+        # Drawdown of the running net win (the balance, less any restarts), relative to the first hand
+        self.peak = 0  # Highest running net so far, starting from 0
+        self.trough = 0  # Lowest running net so far
+        self.max_drawdown = 0  # Largest fall from a peak to a later low
+        self.player_totals = [0] * TOTAL_BINS
+        self.dealer_totals = [0] * TOTAL_BINS
+        self.by_upcard = [[0] * len(OUTCOMES) for _ in UPCARDS]  # [upcard - 2][outcome index]
+
+    def add_hand(self, net, bet, outcome, upcard, player_total, dealer_total):
+        # One settled hand: outcome is an index into OUTCOMES, upcard the dealer's first card value
+        self.hands += 1
+        self.net_sum += net
+        self.net_sq_sum += net * net
+        self.bet_sum += bet
+        if self.net_sum > self.peak:
+            self.peak = self.net_sum
+        elif self.net_sum < self.trough:
+            self.trough = self.net_sum
+        if self.peak - self.net_sum > self.max_drawdown:
+            self.max_drawdown = self.peak - self.net_sum
+        self.player_totals[min(player_total, TOTAL_BINS - 1)] += 1
+        self.dealer_totals[min(dealer_total, TOTAL_BINS - 1)] += 1
+        self.by_upcard[upcard - 2][outcome] += 1
+
+    def record(self, engine):
+        # RoundEngine hook, called once the round is settled and paid out
+        outcome = OUTCOME_INDEX[engine.outcome]
+        bet = engine.player.bet
+        net = OUTCOME_SIGNS[outcome] * bet
+        if self.start_balance is None:
+            self.start_balance = engine.player.balance - net
+        self.add_hand(net, bet, outcome, UPCARD_VALUES[engine.dealer.hand.codes[0]],
+                      engine.player.hand.total, engine.dealer.hand.total)
+
+    def add_record(self, record):
+        # A HandRecord read back from a hand history
+        player, dealer = Hand(), Hand()
+        for code in record.player:
+            player.add_code(code)
+        for code in record.dealer:
+            dealer.add_code(code)
+        outcome = OUTCOME_INDEX[record.outcome]
+        net = OUTCOME_SIGNS[outcome] * record.bet
+        if self.start_balance is None:
+            self.start_balance = record.balance - net
+        self.add_hand(net, record.bet, outcome, UPCARD_VALUES[record.dealer[0]], player.total, dealer.total)
+
+    def merge(self, other):
+        # Append the hands of other as if they were played after these ones, returns self
+        offset = self.net_sum
+        self.max_drawdown = max(self.max_drawdown, other.max_drawdown, self.peak - (offset + other.trough))
+        self.peak = max(self.peak, offset + other.peak)
+        self.trough = min(self.trough, offset + other.trough)
+        if self.start_balance is None:
+            self.start_balance = other.start_balance
+        self.hands += other.hands
+        self.net_sum += other.net_sum
+        self.net_sq_sum += other.net_sq_sum
+        self.bet_sum += other.bet_sum
+        for mine, theirs in ((self.player_totals, other.player_totals), (self.dealer_totals, other.dealer_totals)):
+            for index, count in enumerate(theirs):
+                mine[index] += count
+        for mine, theirs in zip(self.by_upcard, other.by_upcard):
+            for index, count in enumerate(theirs):
+                mine[index] += count
+        return self
+
+    @property
+    def mean(self):
+        # Mean net win per hand
+        return self.net_sum / self.hands if self.hands else 0.0
+
+    @property
+    def variance(self):
+        # Sample variance of the net win per hand, from exact integer sums
+        if self.hands < 2:
+            return 0.0
+        return (self.hands * self.net_sq_sum - self.net_sum * self.net_sum) / (self.hands * (self.hands - 1))
+
+    @property
+    def std_error(self):
+        return (self.variance / self.hands) ** 0.5 if self.hands else 0.0
+
+    @property
+    def drawdown(self):
+        # Current fall from the peak
+        return self.peak - self.net_sum
+
+    def outcome_counts(self):
+        counts = [sum(row[index] for row in self.by_upcard) for index in range(len(OUTCOMES))]
+        return dict(zip(OUTCOME_KEYS, counts))
+
+    def upcard_summary(self):
+        # Outcome counts and win rate for each dealer upcard
+        summary = {}
+        for name, row in zip(UPCARD_NAMES, self.by_upcard):
+            hands = sum(row)
+            wins = sum(count for count, sign in zip(row, OUTCOME_SIGNS) if sign > 0)
+            summary[name] = {**dict(zip(OUTCOME_KEYS, row)), 'hands': hands,
+                             'win_rate': wins / hands if hands else 0.0}
+        return summary
+
+    def summary(self):
+        counts = self.outcome_counts()
+        wins = counts['dealer_bust'] + counts['win']
+        margin = 1.96 * self.std_error
+        return {
+            'hands': self.hands,
+            'net': self.net_sum,
+            'mean': self.mean,
+            'mean_95_ci': (self.mean - margin, self.mean + margin),
+            'variance': self.variance,
+            'return_per_bet': self.net_sum / self.bet_sum if self.bet_sum else 0.0,
+            'win_rate': wins / self.hands if self.hands else 0.0,
+            'push_rate': counts['push'] / self.hands if self.hands else 0.0,
+            'start_balance': self.start_balance,
+            'peak_balance': None if self.start_balance is None else self.start_balance + self.peak,
+            'max_drawdown': self.max_drawdown,
+            'drawdown': self.drawdown,
+            'outcomes': counts,
+        }
+
+    def summary_lines(self):
+        # Short text for the in-game overlay
+        summary = self.summary()
+        low, high = summary['mean_95_ci']
+        upcards = self.upcard_summary()
+        return (
+            f"Hands {self.hands}  net ${self.net_sum}  mean ${self.mean:.2f} ({low:.2f} to {high:.2f})",
+            f"Win {summary['win_rate']:.1%}  push {summary['push_rate']:.1%}  "
+            f"drawdown ${self.drawdown}  max ${self.max_drawdown}",
+            "Win vs " + " ".join(f"{name}:{upcards[name]['win_rate']:.0%}" for name in UPCARD_NAMES),
+        )
+
+    def to_dict(self):
+        # Summary plus the raw counters, from_dict rebuilds a stats object that still merges exactly
+        return {
+            'summary': self.summary(),
+            'upcards': self.upcard_summary(),
+            'counters': {
+                'start_balance': self.start_balance, 'hands': self.hands, 'net_sum': self.net_sum,
+                'net_sq_sum': self.net_sq_sum, 'bet_sum': self.bet_sum, 'peak': self.peak,
+                'trough': self.trough, 'max_drawdown': self.max_drawdown,
+                'player_totals': self.player_totals, 'dealer_totals': self.dealer_totals,
+                'by_upcard': self.by_upcard,
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for name, value in data['counters'].items():
+            setattr(stats, name, value)
+        return stats
+
+    def dump(self, path=None):
+        # Write to a JSON file, returns its path
+        path = path or f"stats_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, 'w') as stats_file:
+            json.dump(self.to_dict(), stats_file, indent=1)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as stats_file:
+            return cls.from_dict(json.load(stats_file))
+
+if __name__ == '__main__':
+    import sys
+    from .history import HandHistory, HISTORY_PATH
+    stats = SessionStats()
+    with HandHistory(sys.argv[1] if len(sys.argv) > 1 else HISTORY_PATH) as history:
+        for record in history:
+            stats.add_record(record)
+    print(json.dumps(stats.to_dict(), indent=1))
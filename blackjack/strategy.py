@@ -0,0 +1,145 @@
+# strategy.py
+#
+# Basic strategy for this game's rules (hit or stand only, dealer stands on all 17s,
+# every win pays even money). The table is generated offline with
+#     python -m blackjack.strategy
+# from the directory that holds Data/, and loaded by Game for the PLAYER_TURN hint.
+
+import os
+import struct
+from functools import lru_cache
+from .constants import values
+from .hand import HARD_VALUES
+
+STRATEGY_MAGIC = b'BJST'
+STRATEGY_VERSION = 1
+STRATEGY_PATH = os.path.join('Data', 'basic_strategy.bin')
+HEADER = struct.Struct('<4sHBBB')  # magic, version, soft flags, totals, upcards
+
+# Table dimensions, indexed directly by soft flag, player total and dealer upcard value (ace = 11)
+TOTALS = 22
+UPCARDS = 12
+STAND, HIT = 0, 1
+
+# Infinite-deck probability of each card value with aces counted as 1 (tens, jacks, queens, kings are all 10)
+CARD_PROBABILITIES = {}
+for value_index in range(len(values)):
+    hard_value = HARD_VALUES[value_index]
+    CARD_PROBABILITIES[hard_value] = CARD_PROBABILITIES.get(hard_value, 0) + 1 / len(values)
+
+def add_card(hard_total, has_ace, card):
+    # State after drawing a card (card value with ace as 1), returns (hard total, has ace, total)
+    hard_total += card
+    has_ace = has_ace or card == 1
+    if has_ace and hard_total + 10 <= 21:
+        return hard_total, has_ace, hard_total + 10
+    return hard_total, has_ace, hard_total
+
+@lru_cache(maxsize=None)
+def dealer_outcomes(hard_total, has_ace):
+    # Probability of each dealer final total (17-21, 22 for bust) from this dealer state
+    _, _, total = add_card(hard_total, has_ace, 0)
+    if total > 21:
+        return {22: 1.0}
+    if total >= 17:  # Dealer stands on 17, soft or hard
+        return {total: 1.0}
+    outcomes = {}
+    for card, probability in CARD_PROBABILITIES.items():
+        next_hard, next_ace, _ = add_card(hard_total, has_ace, card)
+        for final, final_probability in dealer_outcomes(next_hard, next_ace).items():
+            outcomes[final] = outcomes.get(final, 0) + probability * final_probability
+    return outcomes
+
+def dealer_distribution(upcard):
+    # Final totals for a dealer showing this upcard (ace = 11), hole card drawn like any other
+    card = 1 if upcard == 11 else upcard
+    return dealer_outcomes(card, card == 1)
+
+def stand_ev(total, upcard):
+    # Expected net win per unit bet for standing on total, settled as in RoundEngine.process_outcome
+    if total > 21:
+        return -1.0
+    ev = 0.0
+    for final, probability in dealer_distribution(upcard).items():
+        if final > 21 or total > final:
+            ev += probability
+        elif total < final:
+            ev -= probability
+    return ev
+
+def solve(upcard):
+    # Best action and EV for every player state against one upcard, by exact recursion on (hard total, ace)
+    @lru_cache(maxsize=None)
+    def best(hard_total, has_ace):
+        _, _, total = add_card(hard_total, has_ace, 0)
+        if total > 21:
+            return STAND, -1.0
+        stand = stand_ev(total, upcard)
+        hit = 0.0
+        for card, probability in CARD_PROBABILITIES.items():
+            next_hard, next_ace, _ = add_card(hard_total, has_ace, card)
+            hit += probability * best(next_hard, next_ace)[1]
+        return (HIT, hit) if hit > stand else (STAND, stand)
+    return best
+
+def generate_table():
+    # Flat bytearray of actions indexed by (soft, total, upcard), see BasicStrategy.index
+    table = bytearray(2 * TOTALS * UPCARDS)
+    for upcard in range(2, 12):
+        best = solve(upcard)
+        for hard_total in range(2, 22):
+            for has_ace in (False, True):
+                _, _, total = add_card(hard_total, has_ace, 0)
+                if total > 21:
+                    continue
+                soft = has_ace and total != hard_total
+                table[BasicStrategy.index(total, soft, upcard)] = best(hard_total, has_ace)[0]
+    return table
+
+def write_table(path, table):
+    with open(path, 'wb') as table_file:
+        table_file.write(HEADER.pack(STRATEGY_MAGIC, STRATEGY_VERSION, 2, TOTALS, UPCARDS))
+        table_file.write(table)
+
+class BasicStrategy:
+    """ Precomputed hit/stand table, each recommendation is a single index into a bytearray """
+
+    def __init__(self, table):
+        self.table = table
+
+    @staticmethod
+    def index(total, soft, upcard):
+        return (soft * TOTALS + total) * UPCARDS + upcard
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as table_file:
+            data = table_file.read()
+        magic, version, soft_flags, totals, upcards = HEADER.unpack_from(data)
+        if magic != STRATEGY_MAGIC or version != STRATEGY_VERSION or (soft_flags, totals, upcards) != (2, TOTALS, UPCARDS):
+            raise ValueError(f"{path} is not a version {STRATEGY_VERSION} strategy table")
+        return cls(bytearray(data[HEADER.size:]))
+
+    def recommend(self, total, soft, upcard):
+        # "hit" or "stand" for a player total against the dealer's upcard value (ace = 11)
+        if total > 21:
+            return "stand"
+        return "hit" if self.table[self.index(total, soft, upcard)] == HIT else "stand"
+
+    def recommend_hand(self, hand, upcard_card):
+        return self.recommend(hand.total, hand.is_soft, upcard_card.get_value())
+
+def load_strategy(path=None):
+    # Load the generated table, or build it in memory (a few milliseconds) if the file is missing
+    if path is None:
+        from .assets import resource_path
+        path = resource_path(STRATEGY_PATH)
+    if os.path.exists(path):
+        return BasicStrategy.load(path)
+    return BasicStrategy(generate_table())
+
+if __name__ == '__main__':
+    from .assets import resource_path
+    os.makedirs(os.path.dirname(resource_path(STRATEGY_PATH)), exist_ok=True)
+    write_table(resource_path(STRATEGY_PATH), generate_table())
+    print(f"Wrote basic strategy table to {resource_path(STRATEGY_PATH)}")
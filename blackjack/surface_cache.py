@@ -0,0 +1,106 @@
+# surface_cache.py
+
+import threading
+from collections import OrderedDict
+from .constants import CACHED_SIZES, TEXTURE_BUDGET
+from .assets import card_images
+from .utils import scale_image
+
+# Downscaled copies kept of each source image, as fractions of its size. New sizes are scaled from
+# the smallest tier that's still at least as large as the result, so the source is rarely needed.
+TIER_SCALES = (0.5, 0.25)
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+class SurfaceCache:
+    """ Scaled card surfaces shared by every Card, keyed by (card id, size), kept within a memory budget """
+
+    def __init__(self, images, max_sizes=2, budget=None, tier_scales=TIER_SCALES):
+        self.images = images
+        self.max_sizes = max_sizes  # Sizes kept around, older ones are evicted
+        self.sizes = OrderedDict()  # size -> {card id: surface}, most recently used last
+        self.budget = budget  # Resident bytes allowed before sources, old sizes and tiers are dropped
+        self.tier_scales = tier_scales
+        self.tiers = {}  # card id -> {scale: surface}
+        self.source_sizes = {}  # card id -> size of the full source image
+        self.lock = threading.Lock()  # The shoe preparer warms the cache from a worker thread
+
+    def get(self, card_id, size):
+        size = tuple(size)
+        with self.lock:
+            surfaces = self.sizes.get(size)
+            if surfaces is None:
+                surfaces = self.sizes[size] = {}
+                # Drop the least recently used sizes (e.g. from before a resize)
+                while len(self.sizes) > self.max_sizes:
+                    self.sizes.popitem(last=False)
+            else:
+                self.sizes.move_to_end(size)
+            surface = surfaces.get(card_id)
+        if surface is None:
+            # Scale once per size, every card with this id shares the result (scaled outside the lock)
+            surface = scale_image(self.base_image(card_id, size), *size)
+            with self.lock:
+                surface = surfaces.setdefault(card_id, surface)
+            if self.budget is not None:
+                self.enforce_budget()
+        return surface
+
+    def base_image(self, card_id, size):
+        # Smallest tier that still scales down to size, or the source (building the tiers from it)
+        source_size = self.source_sizes.get(card_id)
+        tiers = self.tiers.get(card_id)
+        if source_size is not None and tiers:
+            factor = min(size[0] / source_size[0], size[1] / source_size[1])
+            for scale in sorted(tiers):
+                if scale >= factor:
+                    return tiers[scale]
+
+        source = self.images[card_id]
+        if not tiers:  # First use, or the budget dropped them
+            width, height = source.get_size()
+            built = {scale: scale_image(source, int(width * scale), int(height * scale)) for scale in self.tier_scales}
+            with self.lock:
+                self.source_sizes[card_id] = (width, height)
+                self.tiers[card_id] = built
+        return source
+
+    def resident_bytes(self):
+        # Pixel bytes held by sources, tiers and scaled surfaces
+        with self.lock:
+            sources = sum(surface_bytes(surface) for surface in list(self.images.values()))
+            tiers = sum(surface_bytes(surface) for tiers in self.tiers.values() for surface in tiers.values())
+            scaled = sum(surface_bytes(surface) for surfaces in self.sizes.values() for surface in surfaces.values())
+        return {'sources': sources, 'tiers': tiers, 'scaled': scaled, 'total': sources + tiers + scaled}
+
+    def enforce_budget(self):
+        # Drop, in order, sources that have tiers (they can be loaded again), scaled surfaces of sizes
+        # other than the latest, then tiers from the smallest scale up until under budget
+        if self.resident_bytes()['total'] <= self.budget:
+            return
+        with self.lock:
+            for card_id in list(self.images):
+                if self.tiers.get(card_id):
+                    del self.images[card_id]
+        while len(self.sizes) > 1 and self.resident_bytes()['total'] > self.budget:
+            with self.lock:
+                self.sizes.popitem(last=False)
+        for scale in sorted(self.tier_scales):
+            if self.resident_bytes()['total'] <= self.budget:
+                break
+            with self.lock:
+                for tiers in self.tiers.values():
+                    tiers.pop(scale, None)
+
+    def clear(self):
+        with self.lock:
+            self.sizes.clear()
+            self.tiers.clear()
+            self.source_sizes.clear()
+
+    def __len__(self):
+        return sum(len(surfaces) for surfaces in self.sizes.values())
+
+# Shared cache for all cards, the deck stack and the card back
+card_surfaces = SurfaceCache(card_images, CACHED_SIZES, TEXTURE_BUDGET)
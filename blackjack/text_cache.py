@@ -0,0 +1,40 @@
+# text_cache.py
+
+import pygame
+from collections import OrderedDict
+from .constants import CACHED_SIZES
+
+class TextCache:
+    """ Rendered text surfaces keyed by (font, size, text, colour), least recently used evicted first """
+
+    def __init__(self, max_entries=64, max_fonts=CACHED_SIZES):
+        self.max_entries = max_entries
+        self.max_fonts = max_fonts  # Fonts of the latest window sizes, older ones are evicted
+        self.fonts = OrderedDict()  # (font name, size) -> pygame Font
+        self.surfaces = OrderedDict()  # (font name, size, text, colour) -> rendered surface
+
+    def get_font(self, name, size):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+            if len(self.fonts) > self.max_fonts:
+                self.fonts.popitem(last=False)
+        else:
+            self.fonts.move_to_end(key)
+        return font
+
+    def render(self, name, size, text, color):
+        # Only rasterize text the first time this exact string is shown
+        key = (name, size, text, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = self.get_font(name, size).render(text, True, color)
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def __len__(self):
+        return len(self.surfaces)
@@ -0,0 +1,125 @@
+# tournament.py
+#
+# Pits player policies (see policies.py) against each other on common random numbers: every policy
+# plays hand i from the same shuffled shoe, so the per-hand differences between two policies only
+# come from their decisions. The runner looks at the paired differences every check_every hands and
+# stops once every neighbouring pair in the ranking is separated at the requested confidence.
+
+import random
+from array import array
+from statistics import NormalDist
+from .card import DECK_SIZE
+from .engine import RoundEngine
+
+def play_hand(engine, policy):
+    # One round through RoundEngine.play_round, returns the net win
+    if engine.state == "GAME_ENDED":
+        engine.restart()
+    balance = engine.player.balance
+    if engine.play_round(policy) is None:
+        raise ValueError(f"bet of {policy(None, None, balance)[1]} refused with balance {balance}")
+    return engine.player.balance - balance
+
+class PairStats:
+    """ Running sums of the paired per-hand differences between two policies, kept as exact ints """
+
+    def __init__(self):
+        self.hands = 0
+        self.total = 0
+        self.squares = 0
+
+    def add(self, difference):
+        self.hands += 1
+        self.total += difference
+        self.squares += difference * difference
+
+    @property
+    def mean(self):
+        return self.total / self.hands
+
+    @property
+    def std_error(self):
+        variance = (self.squares - self.total * self.total / self.hands) / max(1, self.hands - 1)
+        return (max(variance, 0.0) / self.hands) ** 0.5
+
+class TournamentResult:
+    """ Mean net win per hand for each policy, best first """
+
+    def __init__(self, hands, names, totals, pairs, settled):
+        self.hands = hands
+        self.means = {name: total / hands for name, total in zip(names, totals)}
+        self.ranking = sorted(names, key=self.means.get, reverse=True)
+        self.pairs = pairs  # (name a, name b) -> PairStats of a - b
+        self.settled = settled
+
+    def difference(self, a, b):
+        # Mean per-hand advantage of a over b and its standard error
+        if (a, b) in self.pairs:
+            pair = self.pairs[(a, b)]
+            return pair.mean, pair.std_error
+        pair = self.pairs[(b, a)]
+        return -pair.mean, pair.std_error
+
+    def summary(self):
+        return {
+            'hands': self.hands,
+            'settled': self.settled,
+            'ranking': [(name, self.means[name]) for name in self.ranking],
+            'gaps': [(a, b, *self.difference(a, b)) for a, b in zip(self.ranking, self.ranking[1:])],
+        }
+
+def run_tournament(policies, confidence=0.95, max_hands=1_000_000, check_every=1000, min_hands=2000,
+                   seed=0, num_decks=1):
+    # policies is {name: policy}. Looks happen every check_every hands; the error budget is split over
+    # the neighbouring pairs and over looks (alpha / (look * (look + 1)) at look k), so stopping early
+    # keeps the overall confidence.
+    names = list(policies)
+    engines = [RoundEngine(num_decks=num_decks, reshuffle_rounds=None) for _ in names]
+    pairs = {(a, b): PairStats() for i, a in enumerate(names) for b in names[i + 1:]}
+    pair_indices = [(names.index(a), names.index(b), pair) for (a, b), pair in pairs.items()]
+    totals = [0] * len(names)
+    alpha = 1 - confidence
+    rng = random.Random(seed)
+    shoe = array('B', range(DECK_SIZE)) * num_decks
+    hands = 0
+    look = 0
+    settled = False
+
+    while hands < max_hands:
+        rng.shuffle(shoe)  # Common random numbers: every policy gets this shoe for this hand
+        nets = []
+        for engine, name in zip(engines, names):
+            engine.deck.load(shoe)
+            nets.append(play_hand(engine, policies[name]))
+        for index, net in enumerate(nets):
+            totals[index] += net
+        for a, b, pair in pair_indices:
+            pair.add(nets[a] - nets[b])
+        hands += 1
+
+        if hands >= min_hands and hands % check_every == 0:
+            look += 1
+            z = NormalDist().inv_cdf(1 - alpha / (look * (look + 1)) / (2 * max(1, len(names) - 1)))
+            result = TournamentResult(hands, names, totals, pairs, False)
+            gaps = [result.difference(a, b) for a, b in zip(result.ranking, result.ranking[1:])]
+            if all(std_error > 0 and mean > z * std_error for mean, std_error in gaps):
+                settled = True
+                break
+    return TournamentResult(hands, names, totals, pairs, settled)
+
+if __name__ == '__main__':
+    import json
+    import time
+    from .policies import HitBelow, StrategyPolicy
+    from .strategy import load_strategy
+    strategy = load_strategy()
+    start = time.perf_counter()
+    result = run_tournament({
+        'basic_strategy': StrategyPolicy(strategy),
+        'hit_below_17': HitBelow(17),
+        'hit_below_13': HitBelow(13),
+        'hit_below_15': HitBelow(15),
+    })
+    summary = result.summary()
+    summary['seconds'] = time.perf_counter() - start
+    print(json.dumps(summary, indent=2))
@@ -2,10 +2,16 @@
 
 import pygame
 
+def display_format(surface):
+    # Copy in the display's pixel format so blits skip per-pixel conversion, once a display exists
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+
 def scale_image(image, target_width, target_height):
     # Scale images once during loading for better performance
     image_width, image_height = image.get_size()
     scale_factor = min(target_width / image_width, target_height / image_height)
     new_width = int(image_width * scale_factor)
     new_height = int(image_height * scale_factor)
-    return pygame.transform.scale(image, (new_width, new_height))
+    return display_format(pygame.transform.scale(image, (new_width, new_height)))
@@ -1,6 +1,7 @@
 import pygame
 import os
-from blackjack.game import Game
+from blackjack.assets import preload_images
+from blackjack.splash import show_splash
 from blackjack.constants import SCREEN_WIDTH, SCREEN_HEIGHT
 import sys
 
@@ -24,7 +25,14 @@ def main():
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
     pygame.display.set_caption("Blackjack")
 
-    # Create and run the game
+    # Decode images on a thread pool, the game starts once the betting screen's are ready
+    images = preload_images()
+    if not show_splash(screen, images):
+        pygame.quit()
+        return
+
+    # Create and run the game (imported here so the splash is up before the game modules load)
+    from blackjack.game import Game
     game = Game(screen)
     game.run()
 